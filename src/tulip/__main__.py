@@ -0,0 +1,30 @@
+"""
+TULIP command-line entry point.
+
+Answers `tulip --version` without importing Typer (and its click/rich
+import graph), and hands every other invocation to the full CLI in
+tulip.cli. Also enables `python -m tulip`.
+"""
+
+import sys
+
+from tulip import __datathon__, __full_name__, __version__
+
+_VERSION_FLAGS = (["--version"], ["-v"])
+
+
+def main() -> None:
+    """Run the TULIP CLI."""
+    if sys.argv[1:] in _VERSION_FLAGS:
+        print(f"🌷 TULIP Version: {__version__}")
+        print(f"   {__full_name__}")
+        print(f"   Datathon: {__datathon__}")
+        return
+    
+    from tulip.cli import app
+    
+    app()
+
+
+if __name__ == "__main__":
+    main()
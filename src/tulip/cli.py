@@ -10,38 +10,133 @@ Commands:
 - tulip validate: Validate configuration and test connection
 """
 
-import json
+import functools
 import logging
 import os
-import subprocess
 import sys
-from pathlib import Path
 from typing import Annotated
 
 import typer
 
-from tulip import __version__, __tool_name__, __full_name__, __datathon__
-from tulip.config import (
-    APP_NAME,
-    DATABASE_NAME,
-    FULL_NAME,
-    UMCDB_TABLES,
-    get_bigquery_config,
-    get_datathon_period_status,
-    is_within_datathon_period,
-    load_runtime_config,
-    logger,
-    save_runtime_config,
-    validate_bigquery_config,
-)
+from tulip import __version__, __tool_name__, __full_name__, __datathon__, __database__
+
+# NOTE: tulip.config is imported inside each command rather than at module
+# level. It configures logging and creates ~/.tulip on import, which eager
+# paths such as `tulip --version` never need.
 
 app = typer.Typer(
     name="tulip",
-    help=f"🌷 {FULL_NAME} - Secure MCP tool for {DATABASE_NAME} via local LLMs.",
+    help=f"🌷 {__full_name__} - Secure MCP tool for {__database__} via local LLMs.",
     add_completion=False,
     rich_markup_mode="markdown",
 )
 
+# Color names bound once as module constants
+_GREEN, _RED, _YELLOW, _WHITE, _BRIGHT_GREEN, _BRIGHT_BLUE = (
+    typer.colors.GREEN,
+    typer.colors.RED,
+    typer.colors.YELLOW,
+    typer.colors.WHITE,
+    typer.colors.BRIGHT_GREEN,
+    typer.colors.BRIGHT_BLUE,
+)
+
+# Decide once whether to emit ANSI styling. Piped output and NO_COLOR get
+# plain text instead of styling that click would strip again line by line.
+_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+
+
+def _style(text: str, **styles) -> str:
+    """Style text for the terminal, or return it unchanged when color is off."""
+    return typer.style(text, **styles) if _COLOR else text
+
+
+def _echo(text: str = "", **styles) -> None:
+    """Echo a line, styled only when writing to a color terminal."""
+    typer.echo(_style(text, **styles))
+
+
+def _ok(text: str) -> str:
+    """Style a success line (green)."""
+    return _style(text, fg=_GREEN)
+
+
+def _err(text: str) -> str:
+    """Style an error line (red)."""
+    return _style(text, fg=_RED)
+
+
+# Section headers never change, so style them once at import time instead
+# of on every invocation
+_HDR_BIGQUERY = _style("☁️  BigQuery Configuration:", fg=_BRIGHT_BLUE, bold=True)
+_HDR_RUNTIME = _style("⚙️  Runtime Configuration:", fg=_BRIGHT_BLUE, bold=True)
+_HDR_TABLES = _style(f"📋 Available Tables ({__database__}):", fg=_BRIGHT_BLUE, bold=True)
+_HDR_SECURITY_FEATURES = _style("🔒 Security Features:", fg=_BRIGHT_BLUE, bold=True)
+_HDR_SECURITY_INFO = _style("\n🔒 TULIP Security & Compliance Information\n", fg=_BRIGHT_BLUE, bold=True)
+_HDR_EULA = _style("📜 EULA Compliance Checklist:", fg=_BRIGHT_GREEN, bold=True)
+_HDR_ACTIVE_FEATURES = _style("🛡️  Active Security Features:", fg=_BRIGHT_GREEN, bold=True)
+_HDR_BEST_PRACTICES = _style("💡 Privacy Best Practices:", fg=_BRIGHT_GREEN, bold=True)
+_HDR_CONTACT = _style("📧 Contact:", fg=_BRIGHT_GREEN, bold=True)
+
+
+def _to_json(obj) -> str:
+    """Serialize CLI output as indented JSON."""
+    import json
+    
+    return json.dumps(obj, indent=2)
+
+
+# Static security report content, rendered once at import for security_cmd
+_EULA_ITEMS = (
+    ("✅", "BigQuery-only access (no local data storage)"),
+    ("✅", "Time-limited to datathon period (Jan-Feb 2026)"),
+    ("✅", "No downloading, copying, or moving data"),
+    ("✅", "No sharing access with unauthorized users"),
+    ("✅", "Non-commercial, scientific research only"),
+    ("✅", "No re-identification attempts blocked"),
+    ("✅", "All code available on GitHub"),
+    ("✅", "Query audit trail maintained"),
+)
+_EULA_RENDERED = "\n".join(f"   {icon} {item}" for icon, item in _EULA_ITEMS)
+
+_SECURITY_FEATURES = (
+    ("SQL Injection Protection", "Validates all queries, blocks injection patterns"),
+    ("Re-identification Prevention", "Blocks queries that could identify individuals"),
+    ("Rate Limiting", "100 queries/hour, 10 queries/minute"),
+    ("K-anonymity Enforcement", "Minimum group size of 5 in aggregations"),
+    ("Query Limits", "Maximum 1000 rows per query"),
+    ("Audit Logging", "Logs query metadata (not results) for compliance"),
+    ("Result Privacy Checks", "Validates results before returning"),
+)
+_FEATURES_RENDERED = "".join(
+    f"   • {feature}\n     {description}\n\n" for feature, description in _SECURITY_FEATURES
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _render_security_report() -> str:
+    """Render the static security report once; it is written in a single call."""
+    return "".join((
+        _HDR_SECURITY_INFO, "\n",
+        # EULA Compliance
+        _HDR_EULA, "\n\n",
+        _EULA_RENDERED, "\n",
+        # Security Features
+        "\n", _HDR_ACTIVE_FEATURES, "\n\n",
+        _FEATURES_RENDERED,
+        # Privacy Recommendations
+        _HDR_BEST_PRACTICES, "\n\n",
+        "   1. Use aggregated queries (COUNT, AVG, etc.) for analysis\n"
+        "   2. Avoid querying individual patient records\n"
+        "   3. Use GROUP BY with HAVING COUNT(*) >= 5\n"
+        "   4. Report any suspected re-identification to administrators\n"
+        "   5. Keep your GCP credentials secure\n\n",
+        # Contact
+        _HDR_CONTACT, "\n\n",
+        "   AmsterdamUMCdb administrators: access@amsterdammedicaldatascience.nl\n"
+        "   Report security issues: [datathon organizers]\n\n",
+    ))
+
 
 def version_callback(value: bool):
     if value:
@@ -75,48 +170,57 @@ def main_callback(
     """
     🌷 TULIP CLI - Secure MCP tool for AmsterdamUMCdb.
     """
-    tulip_logger = logging.getLogger(APP_NAME)
     if verbose:
-        tulip_logger.setLevel(logging.DEBUG)
+        # tulip.config.logger is the module-level "tulip" logger
+        from tulip.config import logger
+        
+        logger.setLevel(logging.DEBUG)
         logger.debug("Verbose mode enabled.")
 
 
 @app.command("status")
 def status_cmd():
     """📊 Show current configuration and security status."""
-    
-    typer.secho(f"\n🌷 {FULL_NAME}", fg=typer.colors.BRIGHT_GREEN, bold=True)
-    typer.secho(f"   Version: {__version__}", fg=typer.colors.WHITE)
-    typer.secho(f"   Datathon: {__datathon__}", fg=typer.colors.WHITE)
+    from tulip.config import (
+        FULL_NAME,
+        UMCDB_TABLES_RENDERED,
+        get_bigquery_config_with_validation,
+        get_datathon_period_status,
+        is_within_datathon_period,
+        load_runtime_config,
+    )
+    
+    _echo(f"\n🌷 {FULL_NAME}", fg=_BRIGHT_GREEN, bold=True)
+    _echo(f"   Version: {__version__}", fg=_WHITE)
+    _echo(f"   Datathon: {__datathon__}", fg=_WHITE)
     
     # Datathon period status
     typer.echo()
     datathon_status = get_datathon_period_status()
     if is_within_datathon_period():
-        typer.secho(datathon_status, fg=typer.colors.GREEN)
+        typer.echo(_ok(datathon_status))
     else:
-        typer.secho(datathon_status, fg=typer.colors.YELLOW)
+        _echo(datathon_status, fg=_YELLOW)
     
     # BigQuery configuration
     typer.echo()
-    typer.secho("☁️  BigQuery Configuration:", fg=typer.colors.BRIGHT_BLUE, bold=True)
+    typer.echo(_HDR_BIGQUERY)
     
-    config = get_bigquery_config()
-    is_valid, msg = validate_bigquery_config()
+    config, is_valid, msg = get_bigquery_config_with_validation()
     
     if is_valid:
-        typer.secho(f"   ✅ Project: {config['project']}", fg=typer.colors.GREEN)
-        typer.secho(f"   ✅ Dataset: {config['dataset']}", fg=typer.colors.GREEN)
+        typer.echo(_ok(f"   ✅ Project: {config['project']}"))
+        typer.echo(_ok(f"   ✅ Dataset: {config['dataset']}"))
     else:
-        typer.secho(f"   ❌ {msg}", fg=typer.colors.RED)
+        typer.echo(_err(f"   ❌ {msg}"))
         typer.echo()
-        typer.secho("   To configure, set environment variables:", fg=typer.colors.YELLOW)
+        _echo("   To configure, set environment variables:", fg=_YELLOW)
         typer.echo("   export TULIP_BQ_PROJECT='your-project-id'")
         typer.echo("   export TULIP_BQ_DATASET='your-dataset-name'")
     
     # Runtime config
     typer.echo()
-    typer.secho("⚙️  Runtime Configuration:", fg=typer.colors.BRIGHT_BLUE, bold=True)
+    typer.echo(_HDR_RUNTIME)
     
     runtime_config = load_runtime_config()
     typer.echo(f"   Query limit default: {runtime_config.get('query_limit_default', 100)}")
@@ -126,19 +230,19 @@ def status_cmd():
     
     # Available tables
     typer.echo()
-    typer.secho(f"📋 Available Tables ({DATABASE_NAME}):", fg=typer.colors.BRIGHT_BLUE, bold=True)
-    for table_name, info in UMCDB_TABLES.items():
-        typer.echo(f"   • {table_name}: {info['description']}")
+    typer.echo(_HDR_TABLES)
+    typer.echo(UMCDB_TABLES_RENDERED)
     
     # Security status
     typer.echo()
-    typer.secho("🔒 Security Features:", fg=typer.colors.BRIGHT_BLUE, bold=True)
-    typer.echo("   ✅ SQL injection protection")
-    typer.echo("   ✅ Re-identification prevention")
-    typer.echo("   ✅ Rate limiting (100/hour, 10/minute)")
-    typer.echo("   ✅ K-anonymity enforcement (min group size: 5)")
-    typer.echo("   ✅ Query audit logging")
-    typer.echo()
+    typer.echo(_HDR_SECURITY_FEATURES)
+    typer.echo(
+        "   ✅ SQL injection protection\n"
+        "   ✅ Re-identification prevention\n"
+        "   ✅ Rate limiting (100/hour, 10/minute)\n"
+        "   ✅ K-anonymity enforcement (min group size: 5)\n"
+        "   ✅ Query audit logging\n"
+    )
 
 
 @app.command("config")
@@ -196,6 +300,13 @@ def config_cmd(
             help="Show current configuration without modifying.",
         ),
     ] = False,
+    recompile: Annotated[
+        bool,
+        typer.Option(
+            "--recompile",
+            help="Regenerate the compiled config cache from config.json.",
+        ),
+    ] = False,
 ):
     """⚙️  Configure TULIP settings for BigQuery and LMStudio.
     
@@ -209,10 +320,31 @@ def config_cmd(
     
     • Show current config:
       `tulip config --show`
+    
+    • Rebuild the compiled config cache:
+      `tulip config --recompile`
     """
+    from tulip.config import (
+        compile_runtime_config,
+        load_runtime_config,
+        save_runtime_config,
+    )
+
+    if recompile:
+        try:
+            cache_path = compile_runtime_config()
+        except FileNotFoundError:
+            typer.echo(_err("❌ No config file found. Save a configuration first."))
+            raise typer.Exit(code=1)
+        except ValueError as e:
+            typer.echo(_err(f"❌ Could not parse config file: {e}"))
+            raise typer.Exit(code=1)
+        typer.echo(_ok(f"✅ Compiled config cache written to: {cache_path}"))
+        return
+    
     if show:
         config = load_runtime_config()
-        typer.echo(json.dumps(config, indent=2))
+        typer.echo(_to_json(config))
         return
     
     # Load existing config
@@ -222,39 +354,39 @@ def config_cmd(
     if project_id:
         config["bigquery_project"] = project_id
         modified = True
-        typer.secho(f"✅ BigQuery project set to: {project_id}", fg=typer.colors.GREEN)
+        typer.echo(_ok(f"✅ BigQuery project set to: {project_id}"))
     
     if dataset:
         config["bigquery_dataset"] = dataset
         modified = True
-        typer.secho(f"✅ BigQuery dataset set to: {dataset}", fg=typer.colors.GREEN)
+        typer.echo(_ok(f"✅ BigQuery dataset set to: {dataset}"))
     
     if dataset_project:
         config["bigquery_dataset_project"] = dataset_project
         modified = True
-        typer.secho(f"✅ Dataset project set to: {dataset_project}", fg=typer.colors.GREEN)
+        typer.echo(_ok(f"✅ Dataset project set to: {dataset_project}"))
     
     if location:
         config["bigquery_location"] = location
         modified = True
-        typer.secho(f"✅ BigQuery location set to: {location}", fg=typer.colors.GREEN)
+        typer.echo(_ok(f"✅ BigQuery location set to: {location}"))
     
     if lmstudio_host:
         config["lmstudio_host"] = lmstudio_host
         modified = True
-        typer.secho(f"✅ LMStudio host set to: {lmstudio_host}", fg=typer.colors.GREEN)
+        typer.echo(_ok(f"✅ LMStudio host set to: {lmstudio_host}"))
     
     if model:
         config["model_name"] = model
         modified = True
-        typer.secho(f"✅ Model set to: {model}", fg=typer.colors.GREEN)
+        typer.echo(_ok(f"✅ Model set to: {model}"))
     
     if modified:
         save_runtime_config(config)
         typer.echo()
-        typer.secho("💾 Configuration saved!", fg=typer.colors.BRIGHT_GREEN)
+        _echo("💾 Configuration saved!", fg=_BRIGHT_GREEN)
         typer.echo()
-        typer.secho("⚠️  Note: Environment variables take precedence over config file.", fg=typer.colors.YELLOW)
+        _echo("⚠️  Note: Environment variables take precedence over config file.", fg=_YELLOW)
         typer.echo("   To use config file values, ensure TULIP_BQ_PROJECT and")
         typer.echo("   TULIP_BQ_DATASET are not set in your environment.")
     else:
@@ -274,27 +406,35 @@ def validate_cmd():
     2. Tests BigQuery connection
     3. Verifies access to AmsterdamUMCdb tables
     """
-    typer.secho("\n🔍 Validating TULIP Configuration...\n", fg=typer.colors.BRIGHT_BLUE, bold=True)
+    from tulip.config import (
+        get_bigquery_config_with_validation,
+        get_bq_client,
+        get_bqstorage_client,
+        get_datathon_period_status,
+        is_within_datathon_period,
+    )
+
+    _echo("\n🔍 Validating TULIP Configuration...\n", fg=_BRIGHT_BLUE, bold=True)
     
     errors = []
     warnings = []
     
     # Check 1: BigQuery configuration
     typer.echo("1️⃣  Checking BigQuery configuration...")
-    is_valid, msg = validate_bigquery_config()
+    config, is_valid, msg = get_bigquery_config_with_validation()
     if is_valid:
-        typer.secho(f"   ✅ {msg}", fg=typer.colors.GREEN)
+        typer.echo(_ok(f"   ✅ {msg}"))
     else:
-        typer.secho(f"   ❌ {msg}", fg=typer.colors.RED)
+        typer.echo(_err(f"   ❌ {msg}"))
         errors.append(msg)
     
     # Check 2: Datathon period
     typer.echo("\n2️⃣  Checking datathon period...")
     if is_within_datathon_period():
-        typer.secho("   ✅ Within datathon period", fg=typer.colors.GREEN)
+        typer.echo(_ok("   ✅ Within datathon period"))
     else:
         status = get_datathon_period_status()
-        typer.secho(f"   ⚠️  {status}", fg=typer.colors.YELLOW)
+        _echo(f"   ⚠️  {status}", fg=_YELLOW)
         warnings.append("Outside datathon period - access may be restricted")
     
     # Check 3: BigQuery connection (only if config is valid)
@@ -303,64 +443,70 @@ def validate_cmd():
         try:
             from google.cloud import bigquery
             
-            config = get_bigquery_config()
-            client = bigquery.Client(project=config["project"])
+            client = get_bq_client(config["project"])
             
-            # Try a simple query
+            # A metadata listing both proves connectivity and enumerates the
+            # tables, without creating any query jobs
             dataset_project = config.get("dataset_project", config["project"])
-            test_query = f"""
-            SELECT table_name 
-            FROM `{dataset_project}.{config['dataset']}.INFORMATION_SCHEMA.TABLES`
-            LIMIT 1
-            """
-            
-            job_config = bigquery.QueryJobConfig()
-            location = config.get("location", "EU")
-            result = client.query(test_query, job_config=job_config, location=location).result()
-            typer.secho("   ✅ BigQuery connection successful", fg=typer.colors.GREEN)
-            
-            # List available tables
+            dataset_ref = bigquery.DatasetReference(dataset_project, config["dataset"])
+            tables = [table.table_id for table in client.list_tables(dataset_ref)]
+            typer.echo(_ok("   ✅ BigQuery connection successful"))
+
+            # Listing tables does not prove the billing project may run
+            # queries. A dry run is only parsed server-side, so it checks
+            # jobs.create without using slots or scanning data.
+            probe_config = bigquery.QueryJobConfig(
+                dry_run=True, use_query_cache=True, maximum_bytes_billed=10_000_000
+            )
+            try:
+                client.query("SELECT 1", job_config=probe_config)
+                typer.echo(_ok("   ✅ Query jobs can be created"))
+            except Exception as e:
+                _echo(f"   ⚠️  Query dry run failed: {e}", fg=_YELLOW)
+                warnings.append("Cannot create query jobs - check BigQuery Job User role on the project")
+
             typer.echo("\n4️⃣  Checking available tables...")
-            tables_query = f"""
-            SELECT table_name 
-            FROM `{dataset_project}.{config['dataset']}.INFORMATION_SCHEMA.TABLES`
-            ORDER BY table_name
-            """
-            tables = [row.table_name for row in client.query(tables_query, job_config=job_config, location=location).result()]
-            
             if tables:
-                typer.secho(f"   ✅ Found {len(tables)} tables:", fg=typer.colors.GREEN)
+                typer.echo(_ok(f"   ✅ Found {len(tables)} tables:"))
                 for table in tables[:10]:
                     typer.echo(f"      • {table}")
                 if len(tables) > 10:
                     typer.echo(f"      ... and {len(tables) - 10} more")
             else:
-                typer.secho("   ⚠️  No tables found in dataset", fg=typer.colors.YELLOW)
+                _echo("   ⚠️  No tables found in dataset", fg=_YELLOW)
                 warnings.append("No tables found - check dataset name")
+            
+            typer.echo("\n5️⃣  Checking BigQuery Storage Read API...")
+            if get_bqstorage_client() is not None:
+                typer.echo(_ok("   ✅ Arrow result streaming available"))
+            else:
+                # Optional speed-up only, so not counted as a validation warning
+                _echo("   💡 Not installed - large results use the slower REST API", fg=_YELLOW)
+                typer.echo('      Install with: pip install "tulip-mcp[storage]"')
         
         except ImportError:
-            typer.secho("   ❌ google-cloud-bigquery not installed", fg=typer.colors.RED)
+            typer.echo(_err("   ❌ google-cloud-bigquery not installed"))
             errors.append("Install with: pip install google-cloud-bigquery")
         
         except Exception as e:
-            typer.secho(f"   ❌ Connection failed: {e}", fg=typer.colors.RED)
+            typer.echo(_err(f"   ❌ Connection failed: {e}"))
             errors.append(f"BigQuery connection error: {e}")
     
     # Summary
     typer.echo("\n" + "="*50)
     if errors:
-        typer.secho("❌ Validation FAILED", fg=typer.colors.RED, bold=True)
+        _echo("❌ Validation FAILED", fg=_RED, bold=True)
         typer.echo("\nErrors:")
         for error in errors:
-            typer.secho(f"  • {error}", fg=typer.colors.RED)
+            typer.echo(_err(f"  • {error}"))
         raise typer.Exit(code=1)
     elif warnings:
-        typer.secho("⚠️  Validation PASSED with warnings", fg=typer.colors.YELLOW, bold=True)
+        _echo("⚠️  Validation PASSED with warnings", fg=_YELLOW, bold=True)
         typer.echo("\nWarnings:")
         for warning in warnings:
-            typer.secho(f"  • {warning}", fg=typer.colors.YELLOW)
+            _echo(f"  • {warning}", fg=_YELLOW)
     else:
-        typer.secho("✅ Validation PASSED", fg=typer.colors.GREEN, bold=True)
+        _echo("✅ Validation PASSED", fg=_GREEN, bold=True)
     
     typer.echo()
 
@@ -393,6 +539,8 @@ def mcp_config_cmd(
     
     `tulip mcp-config lmstudio`
     """
+    from tulip.config import get_bigquery_config, load_runtime_config
+
     # Get current Python path and configuration
     python_path = sys.executable
     config = get_bigquery_config()
@@ -428,29 +576,32 @@ def mcp_config_cmd(
         }
     }
     
-    typer.secho("\n🔧 TULIP MCP Configuration\n", fg=typer.colors.BRIGHT_BLUE, bold=True)
+    _echo("\n🔧 TULIP MCP Configuration\n", fg=_BRIGHT_BLUE, bold=True)
     
     if client and client.lower() == "lmstudio":
-        typer.secho("📋 LMStudio Configuration:", fg=typer.colors.BRIGHT_GREEN, bold=True)
+        _echo("📋 LMStudio Configuration:", fg=_BRIGHT_GREEN, bold=True)
         typer.echo()
         typer.echo("1. Open LMStudio Settings > MCP Servers")
         typer.echo("2. Add a new server with this configuration:")
         typer.echo()
     
-    typer.secho("Option 1 - Using Python directly:", fg=typer.colors.WHITE, bold=True)
-    typer.echo(json.dumps(mcp_config, indent=2))
+    # Serialized once: the same text is printed and optionally saved
+    mcp_config_json = _to_json(mcp_config)
+    
+    _echo("Option 1 - Using Python directly:", fg=_WHITE, bold=True)
+    typer.echo(mcp_config_json)
     
     typer.echo()
-    typer.secho("Option 2 - Using uvx (recommended if installed):", fg=typer.colors.WHITE, bold=True)
-    typer.echo(json.dumps(uvx_config, indent=2))
+    _echo("Option 2 - Using uvx (recommended if installed):", fg=_WHITE, bold=True)
+    typer.echo(_to_json(uvx_config))
     
     if output:
         with open(output, "w") as f:
-            json.dump(mcp_config, f, indent=2)
-        typer.secho(f"\n💾 Configuration saved to: {output}", fg=typer.colors.GREEN)
+            f.write(mcp_config_json)
+        typer.echo(_ok(f"\n💾 Configuration saved to: {output}"))
     
     typer.echo()
-    typer.secho("⚠️  Important:", fg=typer.colors.YELLOW, bold=True)
+    _echo("⚠️  Important:", fg=_YELLOW, bold=True)
     typer.echo("   • Ensure TULIP_BQ_PROJECT and TULIP_BQ_DATASET are configured")
     typer.echo("   • Set up GCP authentication (gcloud auth application-default login)")
     typer.echo("   • Use local models only - do not send data to external APIs")
@@ -466,63 +617,7 @@ def security_cmd():
     - Rate limiting status
     - EULA compliance checklist
     """
-    typer.secho("\n🔒 TULIP Security & Compliance Information\n", fg=typer.colors.BRIGHT_BLUE, bold=True)
-    
-    # EULA Compliance
-    typer.secho("📜 EULA Compliance Checklist:", fg=typer.colors.BRIGHT_GREEN, bold=True)
-    typer.echo()
-    
-    eula_items = [
-        ("✅", "BigQuery-only access (no local data storage)"),
-        ("✅", "Time-limited to datathon period (Jan-Feb 2026)"),
-        ("✅", "No downloading, copying, or moving data"),
-        ("✅", "No sharing access with unauthorized users"),
-        ("✅", "Non-commercial, scientific research only"),
-        ("✅", "No re-identification attempts blocked"),
-        ("✅", "All code available on GitHub"),
-        ("✅", "Query audit trail maintained"),
-    ]
-    
-    for icon, item in eula_items:
-        typer.echo(f"   {icon} {item}")
-    
-    # Security Features
-    typer.echo()
-    typer.secho("🛡️  Active Security Features:", fg=typer.colors.BRIGHT_GREEN, bold=True)
-    typer.echo()
-    
-    features = [
-        ("SQL Injection Protection", "Validates all queries, blocks injection patterns"),
-        ("Re-identification Prevention", "Blocks queries that could identify individuals"),
-        ("Rate Limiting", "100 queries/hour, 10 queries/minute"),
-        ("K-anonymity Enforcement", "Minimum group size of 5 in aggregations"),
-        ("Query Limits", "Maximum 1000 rows per query"),
-        ("Audit Logging", "Logs query metadata (not results) for compliance"),
-        ("Result Privacy Checks", "Validates results before returning"),
-    ]
-    
-    for feature, description in features:
-        typer.echo(f"   • {feature}")
-        typer.echo(f"     {description}")
-        typer.echo()
-    
-    # Privacy Recommendations
-    typer.secho("💡 Privacy Best Practices:", fg=typer.colors.BRIGHT_GREEN, bold=True)
-    typer.echo()
-    typer.echo("   1. Use aggregated queries (COUNT, AVG, etc.) for analysis")
-    typer.echo("   2. Avoid querying individual patient records")
-    typer.echo("   3. Use GROUP BY with HAVING COUNT(*) >= 5")
-    typer.echo("   4. Report any suspected re-identification to administrators")
-    typer.echo("   5. Keep your GCP credentials secure")
-    typer.echo()
-    
-    # Contact
-    typer.secho("📧 Contact:", fg=typer.colors.BRIGHT_GREEN, bold=True)
-    typer.echo()
-    typer.echo("   AmsterdamUMCdb administrators: access@amsterdammedicaldatascience.nl")
-    typer.echo("   Report security issues: [datathon organizers]")
-    typer.echo()
-
+    typer.echo(_render_security_report(), nl=False)
 
 if __name__ == "__main__":
     app()
@@ -10,9 +10,17 @@ EULA COMPLIANCE NOTES:
 - Access is time-limited (January-February 2026 for ESICM Datathon)
 """
 
+import functools
+import hashlib
 import json
 import logging
+import marshal
 import os
+import tempfile
+import threading
+import time
+import types
+from collections.abc import Mapping
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -37,15 +45,20 @@ logger = logging.getLogger(APP_NAME)
 DATATHON_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
 DATATHON_END = datetime(2026, 2, 28, 23, 59, 59, tzinfo=timezone.utc)
 
-
-def is_within_datathon_period() -> bool:
-    """Check if current time is within the allowed datathon period."""
-    now = datetime.now(timezone.utc)
-    return DATATHON_START <= now <= DATATHON_END
+# POSIX bounds so the per-query period check is a plain float comparison
+_DATATHON_START_TS = DATATHON_START.timestamp()
+_DATATHON_END_TS = DATATHON_END.timestamp()
 
 
-def get_datathon_period_status() -> str:
-    """Get human-readable status of the datathon period."""
+@functools.lru_cache(maxsize=1)
+def _datathon_status_for_minute(minute: int) -> str:
+    """
+    Render the datathon period status once per wall-clock minute.
+    
+    The CLI and the MCP server show this status on every command/tool call.
+    It only changes at day boundaries, so recomputing it once per minute
+    keeps it fresh without a datetime per call.
+    """
     now = datetime.now(timezone.utc)
     if now < DATATHON_START:
         return f"⏳ Datathon has not started yet. Starts: {DATATHON_START.strftime('%Y-%m-%d')}"
@@ -56,6 +69,16 @@ def get_datathon_period_status() -> str:
         return f"✅ Within datathon period. {days_remaining} days remaining until {DATATHON_END.strftime('%Y-%m-%d')}"
 
 
+def is_within_datathon_period() -> bool:
+    """Check if current time is within the allowed datathon period."""
+    return _DATATHON_START_TS <= time.time() <= _DATATHON_END_TS
+
+
+def get_datathon_period_status() -> str:
+    """Get human-readable status of the datathon period."""
+    return _datathon_status_for_minute(int(time.time() // 60))
+
+
 # -------------------------------------------------------------------
 # Configuration Directory (for non-sensitive settings only)
 # -------------------------------------------------------------------
@@ -68,6 +91,8 @@ def _get_config_dir() -> Path:
 
 _CONFIG_DIR = _get_config_dir()
 _RUNTIME_CONFIG_PATH = _CONFIG_DIR / "config.json"
+# Pre-parsed copy of config.json, tagged with the SHA-256 of the JSON source
+_RUNTIME_CONFIG_CACHE_PATH = _CONFIG_DIR / "config.cache"
 
 
 # -------------------------------------------------------------------
@@ -124,12 +149,133 @@ UMCDB_TABLES = {
     },
 }
 
+# The table list never changes at runtime, so render the CLI listing once
+UMCDB_TABLES_RENDERED = "\n".join(
+    f"   • {name}: {info['description']}" for name, info in UMCDB_TABLES.items()
+)
+
 # OMOP Vocabulary - AmsterdamUMCdb Dictionary
 # Since vocabulary tables aren't in the dataset, we use the public dictionary
 AMSTERDAMUMCDB_DICTIONARY_URL = "https://raw.githubusercontent.com/AmsterdamUMC/AmsterdamUMCdb/master/amsterdamumcdb/dictionary/dictionary.csv"
 
 # Cache for dictionary (loaded once per session)
 _dictionary_cache = None
+_dictionary_lock = threading.Lock()
+
+# The only dictionary columns TULIP uses, with explicit dtypes so nothing is
+# inferred as object; domain and vocabulary have few distinct values
+_DICTIONARY_DTYPES = {
+    'concept_id': 'Int64',
+    'concept_name': 'string',
+    'domain_id': 'category',
+    'vocabulary_id': 'category',
+    'source_code_description': 'string',
+}
+
+# pandas module, imported on first dictionary use (see _require_pandas)
+_pd = None
+
+# Local copy of the public dictionary, revalidated against GitHub by ETag so
+# later process starts skip the download and CSV parse
+_DICTIONARY_PARQUET_PATH = _CONFIG_DIR / "dictionary.parquet"
+_DICTIONARY_ETAG_PATH = _CONFIG_DIR / "dictionary.etag"
+
+# concept_id -> concept details, built once from the cached dictionary
+_concept_index = None
+
+# Character trigram -> row positions, built on the first dictionary search
+_trigram_index = None
+
+
+def _prepare_dictionary(df):
+    """
+    Add lowercased copies of the searchable text columns.
+    
+    Searches compare against these with plain substring matching, so the
+    whole dictionary is case-folded once at load instead of on every search.
+    """
+    for column, lower in (
+        ('concept_name', '_cn_lower'),
+        ('source_code_description', '_sd_lower'),
+        ('domain_id', '_dom_lower'),
+    ):
+        df[lower] = df[column].astype('string').fillna('').str.lower()
+    return df
+
+
+def _require_pandas():
+    """
+    Import pandas on first use and reuse the module afterwards.
+    
+    pandas is only needed for the dictionary, so it is not imported at
+    module load; after the first call this is a single global read.
+    """
+    global _pd
+    
+    if _pd is None:
+        import pandas
+        
+        _pd = pandas
+    return _pd
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_session():
+    """
+    Get a shared HTTP session for dictionary requests.
+    
+    Keep-alive lets repeat requests to GitHub (e.g. ETag revalidation)
+    reuse the pooled TLS connection instead of a fresh handshake.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _read_dictionary_etag() -> str | None:
+    """Return the ETag of the local dictionary copy, if one exists."""
+    try:
+        if _DICTIONARY_PARQUET_PATH.exists():
+            return _DICTIONARY_ETAG_PATH.read_text().strip() or None
+    except OSError:
+        pass
+    return None
+
+
+def _drop_dictionary_etag() -> None:
+    """Forget the local copy's ETag so the next request is unconditional."""
+    try:
+        _DICTIONARY_ETAG_PATH.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _request_dictionary(headers: dict):
+    """GET the dictionary CSV as a stream, raising on HTTP errors."""
+    response = _get_http_session().get(
+        AMSTERDAMUMCDB_DICTIONARY_URL, headers=headers, stream=True, timeout=30
+    )
+    response.raise_for_status()
+    return response
+
+
+def _write_dictionary_copy(df, etag: str | None) -> None:
+    """Persist the parsed dictionary and its ETag (best effort)."""
+    if not etag:
+        return
+    
+    tmp_path = _DICTIONARY_PARQUET_PATH.with_suffix(".parquet.tmp")
+    try:
+        df.to_parquet(tmp_path, compression="zstd", index=False)
+        os.replace(tmp_path, _DICTIONARY_PARQUET_PATH)
+        _DICTIONARY_ETAG_PATH.write_text(etag)
+    except Exception as e:
+        logger.debug(f"Could not write local dictionary copy: {e}")
 
 
 def get_amsterdamumcdb_dictionary():
@@ -149,33 +295,95 @@ def get_amsterdamumcdb_dictionary():
     if _dictionary_cache is not None:
         return _dictionary_cache
     
-    try:
-        import pandas as pd
-        import requests
-        from io import StringIO
+    # Concurrent tool calls must not each download and parse the dictionary
+    with _dictionary_lock:
+        if _dictionary_cache is not None:
+            return _dictionary_cache
         
-        logger.info("Downloading AmsterdamUMCdb dictionary from GitHub...")
+        try:
+            import requests
+            
+            pd = _require_pandas()
         
-        # Download dictionary CSV
-        response = requests.get(AMSTERDAMUMCDB_DICTIONARY_URL, timeout=30)
-        response.raise_for_status()
+            # Conditional request: GitHub answers 304 if our local copy is current
+            etag = _read_dictionary_etag()
+            headers = {"If-None-Match": etag} if etag else {}
         
-        # Parse CSV
-        csv_data = StringIO(response.text)
-        df = pd.read_csv(csv_data)
+            try:
+                response = _request_dictionary(headers)
+            except requests.RequestException as e:
+                if etag is None:
+                    raise
+                logger.warning(f"Could not revalidate dictionary ({e}), using local copy")
+                response = None
         
-        # Cache it
-        _dictionary_cache = df
+            df = None
+            if response is None or response.status_code == 304:
+                try:
+                    df = pd.read_parquet(_DICTIONARY_PARQUET_PATH)
+                except Exception as e:
+                    # Corrupt or unreadable local copy: forget its ETag and
+                    # fetch the whole file again
+                    logger.warning(f"Could not read local dictionary copy ({e}), downloading it again")
+                    _drop_dictionary_etag()
+                    response = _request_dictionary({})
         
-        logger.info(f"Dictionary loaded: {len(df)} concept mappings")
-        return df
+            if df is None:
+                logger.info("Downloading AmsterdamUMCdb dictionary from GitHub...")
+            
+                # Parse CSV straight from the socket with Arrow's multi-threaded
+                # reader, without first decoding the whole body into a Python str
+                response.raw.decode_content = True
+                df = pd.read_csv(
+                    response.raw,
+                    engine="pyarrow",
+                    usecols=list(_DICTIONARY_DTYPES),
+                    dtype=_DICTIONARY_DTYPES,
+                )
+                _write_dictionary_copy(df, response.headers.get("ETag"))
         
-    except Exception as e:
-        logger.error(f"Failed to load dictionary: {e}")
-        raise RuntimeError(
-            f"Could not load AmsterdamUMCdb dictionary: {e}. "
-            "This is required for concept name lookups."
-        )
+            # Cache it
+            _dictionary_cache = _prepare_dictionary(df)
+        
+            logger.info(f"Dictionary loaded: {len(df)} concept mappings")
+            return df
+        
+        except Exception as e:
+            logger.error(f"Failed to load dictionary: {e}")
+            raise RuntimeError(
+                f"Could not load AmsterdamUMCdb dictionary: {e}. "
+                "This is required for concept name lookups."
+            )
+
+
+def _index_dictionary(df) -> dict:
+    """
+    Build a concept_id lookup index from the dictionary DataFrame.
+    
+    Keeps the first row per concept_id (there may be multiple source
+    mappings) and normalizes NaN to None once, so lookups are O(1).
+    """
+    pd = _require_pandas()
+    
+    ids = df['concept_id']
+    first = df[ids.notna() & ~ids.duplicated()]
+    
+    index = {}
+    for cid, name, domain, vocabulary, description in zip(
+        first['concept_id'],
+        first['concept_name'],
+        first['domain_id'],
+        first['vocabulary_id'],
+        first['source_code_description'],
+    ):
+        index[int(cid)] = {
+            'concept_id': int(cid),
+            'concept_name': str(name),
+            'domain_id': str(domain),
+            'vocabulary_id': str(vocabulary) if pd.notna(vocabulary) else None,
+            'source_code_description': str(description) if pd.notna(description) else None,
+        }
+    return index
 
 
 def lookup_concept_in_dictionary(concept_id: int):
@@ -188,25 +396,61 @@ def lookup_concept_in_dictionary(concept_id: int):
     Returns:
         dict with concept details or None if not found
     """
-    import pandas as pd
+    global _concept_index
     
     df = get_amsterdamumcdb_dictionary()
+    if _concept_index is None:
+        _concept_index = _index_dictionary(df)
     
-    # Find matching concept
-    matches = df[df['concept_id'] == concept_id]
+    concept = _concept_index.get(concept_id)
+    return dict(concept) if concept is not None else None
+
+
+def _build_trigram_index(df) -> dict:
+    """Map each trigram of the lowercased search columns to sorted row positions."""
+    import numpy as np
+    
+    postings = {}
+    for pos, (name, description) in enumerate(zip(df['_cn_lower'], df['_sd_lower'])):
+        grams = {name[i:i + 3] for i in range(len(name) - 2)}
+        grams.update(description[i:i + 3] for i in range(len(description) - 2))
+        for gram in grams:
+            postings.setdefault(gram, []).append(pos)
+    
+    return {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+
+def _candidate_rows(df, needle: str):
+    """
+    Narrow a substring search to rows containing every trigram of the needle.
     
-    if matches.empty:
+    Returns:
+        Sorted array of row positions, or None when the needle is too short
+        to use the index and the whole dictionary must be scanned
+    """
+    global _trigram_index
+    
+    if len(needle) < 3:
         return None
     
-    # Return first match (there may be multiple source mappings)
-    row = matches.iloc[0]
-    return {
-        'concept_id': int(row['concept_id']),
-        'concept_name': str(row['concept_name']),
-        'domain_id': str(row['domain_id']),
-        'vocabulary_id': str(row['vocabulary_id']) if pd.notna(row['vocabulary_id']) else None,
-        'source_code_description': str(row['source_code_description']) if pd.notna(row['source_code_description']) else None,
-    }
+    import numpy as np
+    
+    if _trigram_index is None:
+        with _dictionary_lock:
+            if _trigram_index is None:
+                _trigram_index = _build_trigram_index(df)
+    
+    empty = np.empty(0, dtype=np.int64)
+    postings = sorted(
+        (_trigram_index.get(needle[i:i + 3], empty) for i in range(len(needle) - 2)),
+        key=len,
+    )
+    rows = postings[0]
+    for other in postings[1:]:
+        if not len(rows):
+            break
+        rows = np.intersect1d(rows, other, assume_unique=True)
+    return rows
 
 
 def search_concepts_in_dictionary(search_term: str, domain: str | None = None, limit: int = 20):
@@ -221,27 +465,40 @@ def search_concepts_in_dictionary(search_term: str, domain: str | None = None, l
     Returns:
         list of matching concept dicts
     """
-    import pandas as pd
+    pd = _require_pandas()
     
     df = get_amsterdamumcdb_dictionary()
     
-    # Search in concept_name and source_code_description
+    # Search in concept_name and source_code_description (plain substring,
+    # case-insensitive via the lowercased columns)
+    needle = search_term.lower()
+    
+    # Only rows sharing all of the needle's trigrams can match; verify those
+    candidates = _candidate_rows(df, needle)
+    if candidates is not None:
+        df = df.iloc[candidates]
+    
     mask = (
-        df['concept_name'].str.contains(search_term, case=False, na=False) |
-        df['source_code_description'].str.contains(search_term, case=False, na=False)
+        df['_cn_lower'].str.contains(needle, regex=False) |
+        df['_sd_lower'].str.contains(needle, regex=False)
     )
     
     # Apply domain filter if specified
     if domain:
-        mask = mask & (df['domain_id'].str.contains(domain, case=False, na=False))
+        mask = mask & df['_dom_lower'].str.contains(domain.lower(), regex=False)
     
     matches = df[mask].head(limit)
     
+    # Convert the matched slice in one go instead of a Series per row
+    records = matches[
+        ['concept_id', 'concept_name', 'domain_id', 'source_code_description']
+    ].to_dict(orient='records')
+    
     results = []
-    for _, row in matches.iterrows():
+    for row in records:
         # Handle both mapped and unmapped concepts
         cid = row['concept_id']
-        is_mapped = pd.notna(cid) and cid > 0
+        is_mapped = bool(pd.notna(cid) and cid > 0)
         
         results.append({
             'concept_id': int(cid) if is_mapped else None,
@@ -259,14 +516,26 @@ DEFAULT_BIGQUERY_PROJECT = os.getenv("TULIP_BQ_PROJECT", "")
 DEFAULT_BIGQUERY_DATASET = os.getenv("TULIP_BQ_DATASET", "")
 
 
-def get_bigquery_table_path(table_name: str) -> str:
+@functools.lru_cache(maxsize=128)
+def _table_path(dataset_project: str, dataset: str, table_name: str) -> str:
+    """Format a table path once per (dataset, table)."""
+    # Backtick each component separately to avoid project:dataset interpretation
+    return f"`{dataset_project}`.`{dataset}`.`{table_name}`"
+
+
+def get_bigquery_table_path(table_name: str, config: dict | None = None) -> str:
     """
     Get fully qualified BigQuery table path.
     
     Format: `project`.`dataset`.`table` (each component backticked separately)
     Supports dataset in different project.
+    
+    Args:
+        table_name: Table name within the dataset
+        config: Already-resolved BigQuery config (default: get_bigquery_config())
     """
-    config = get_bigquery_config()
+    if config is None:
+        config = get_bigquery_config()
     dataset_project = config.get("dataset_project", config["project"])
     dataset = config["dataset"]
     
@@ -276,17 +545,24 @@ def get_bigquery_table_path(table_name: str) -> str:
             "Set TULIP_BQ_PROJECT and TULIP_BQ_DATASET environment variables."
         )
     
-    # Backtick each component separately to avoid project:dataset interpretation
-    return f"`{dataset_project}`.`{dataset}`.`{table_name}`"
+    return _table_path(dataset_project, dataset, table_name)
+
+
+# Fixed table set: exact-name membership test and a shared name tuple
+_UMCDB_KEYS = frozenset(UMCDB_TABLES)
+_AVAILABLE_TABLES = tuple(UMCDB_TABLES)
 
 
-def get_available_tables() -> list[str]:
-    """Return list of available table names."""
-    return list(UMCDB_TABLES.keys())
+def get_available_tables() -> tuple[str, ...]:
+    """Return the available table names."""
+    return _AVAILABLE_TABLES
 
 
 def get_table_info(table_name: str) -> dict | None:
     """Get information about a specific table."""
+    # Programmatic callers already pass lowercase names; skip .lower() then
+    if table_name in _UMCDB_KEYS:
+        return UMCDB_TABLES[table_name]
     return UMCDB_TABLES.get(table_name.lower())
 
 
@@ -312,19 +588,113 @@ def _get_default_runtime_config() -> dict:
     }
 
 
-def load_runtime_config() -> dict:
-    """Load runtime configuration from config file."""
-    if _RUNTIME_CONFIG_PATH.exists():
+# Parsed runtime config, keyed by the config file's st_mtime_ns (None when
+# there is no config file and the defaults are used)
+_runtime_config_cache: tuple[int | None, dict] | None = None
+
+
+def _write_compiled_runtime_config(digest: str, config: dict) -> None:
+    """Write the pre-parsed config next to config.json (best effort)."""
+    try:
+        with open(_RUNTIME_CONFIG_CACHE_PATH, "wb") as f:
+            marshal.dump((digest, config), f)
+    except Exception as e:
+        logger.debug(f"Could not write compiled runtime config: {e}")
+
+
+def _read_compiled_runtime_config(digest: str) -> dict | None:
+    """
+    Return the pre-parsed config if it was compiled from this JSON source.
+    
+    marshal is not safe against maliciously crafted data; the cache is only
+    trusted because it lives in the user's own config directory, next to the
+    config.json it was compiled from.
+    """
+    try:
+        with open(_RUNTIME_CONFIG_CACHE_PATH, "rb") as f:
+            cached_digest, config = marshal.load(f)
+    except Exception:
+        return None
+    
+    if cached_digest != digest or not isinstance(config, dict):
+        return None
+    return config
+
+
+def _parse_runtime_config(raw: bytes, use_compiled: bool = True) -> dict:
+    """Parse config.json contents, going through the compiled cache when valid."""
+    digest = hashlib.sha256(raw).hexdigest()
+    
+    config = _read_compiled_runtime_config(digest) if use_compiled else None
+    if config is None:
+        config = json.loads(raw)
+        _write_compiled_runtime_config(digest, config)
+    
+    return config
+
+
+def _load_runtime_config_shared() -> dict:
+    """
+    Return the cached runtime config itself, reloading it if the file changed.
+    
+    The returned dict is shared; callers must not modify it.
+    """
+    global _runtime_config_cache
+    
+    try:
+        mtime_ns = os.stat(_RUNTIME_CONFIG_PATH).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    
+    if _runtime_config_cache is not None and _runtime_config_cache[0] == mtime_ns:
+        return _runtime_config_cache[1]
+    
+    if mtime_ns is None:
+        config = _get_default_runtime_config()
+    else:
         try:
-            with open(_RUNTIME_CONFIG_PATH) as f:
-                config = json.load(f)
-                # Merge with defaults to ensure all keys exist
-                defaults = _get_default_runtime_config()
-                defaults.update(config)
-                return defaults
+            parsed = _parse_runtime_config(_RUNTIME_CONFIG_PATH.read_bytes())
+            # Merge with defaults to ensure all keys exist
+            config = _get_default_runtime_config()
+            config.update(parsed)
         except Exception as e:
+            # Cached like a good parse, so a broken file is only re-read
+            # (and warned about) once it changes
             logger.warning(f"Could not parse runtime config: {e}. Using defaults.")
-    return _get_default_runtime_config()
+            config = _get_default_runtime_config()
+    
+    _runtime_config_cache = (mtime_ns, config)
+    return config
+
+
+def load_runtime_config() -> dict:
+    """
+    Load runtime configuration from config file.
+    
+    The parsed file is cached per process and only re-read when its
+    modification time changes. Across processes, a compiled copy of the
+    file (see compile_runtime_config) skips the JSON parse as long as the
+    source is unchanged. Callers get a copy they may modify freely.
+    """
+    return dict(_load_runtime_config_shared())
+
+
+def compile_runtime_config() -> Path:
+    """
+    Regenerate the compiled runtime config from config.json.
+    
+    Returns:
+        Path of the compiled cache file
+    
+    Raises:
+        FileNotFoundError: If no config.json has been saved yet
+        ValueError: If config.json is not valid JSON
+    """
+    global _runtime_config_cache
+    
+    _parse_runtime_config(_RUNTIME_CONFIG_PATH.read_bytes(), use_compiled=False)
+    _runtime_config_cache = None
+    return _RUNTIME_CONFIG_CACHE_PATH
 
 
 def save_runtime_config(config: dict) -> None:
@@ -332,36 +702,115 @@ def save_runtime_config(config: dict) -> None:
     # SECURITY: Ensure sensitive data is not stored
     safe_config = {k: v for k, v in config.items() if not k.startswith("_")}
     
-    with open(_RUNTIME_CONFIG_PATH, "w") as f:
-        json.dump(safe_config, indent=2, fp=f)
+    global _runtime_config_cache
+    
+    raw = json.dumps(safe_config, indent=2).encode()
+    # Write to a temp file in the same directory and rename it into place, so
+    # an interrupted save never leaves a truncated config.json behind
+    tf = tempfile.NamedTemporaryFile(
+        "wb", dir=_RUNTIME_CONFIG_PATH.parent, prefix=".cfg-", delete=False
+    )
+    try:
+        with tf:
+            tf.write(raw)
+        os.replace(tf.name, _RUNTIME_CONFIG_PATH)
+    except BaseException:
+        os.unlink(tf.name)
+        raise
+    _write_compiled_runtime_config(hashlib.sha256(raw).hexdigest(), safe_config)
+    
+    # Coarse mtime resolution could otherwise serve the previous contents
+    _runtime_config_cache = None
     
     logger.info(f"Configuration saved to {_RUNTIME_CONFIG_PATH}")
 
 
+_BIGQUERY_ENV_VARS = (
+    "TULIP_BQ_PROJECT",
+    "TULIP_BQ_DATASET_PROJECT",
+    "TULIP_BQ_DATASET",
+    "TULIP_BQ_LOCATION",
+)
+
+# Resolved BigQuery config, keyed by the env var values and the cached
+# runtime config object it was resolved from (None if the file was skipped)
+_bigquery_config_cache: tuple[tuple, dict | None, dict] | None = None
+
+
 def get_bigquery_config() -> dict:
-    """Get BigQuery configuration from environment and config file."""
-    config = load_runtime_config()
+    """
+    Get BigQuery configuration from environment and config file.
     
-    project = os.getenv("TULIP_BQ_PROJECT", config.get("bigquery_project", ""))
-    dataset_project = os.getenv("TULIP_BQ_DATASET_PROJECT", config.get("bigquery_dataset_project", ""))
+    The result is resolved once and reused until one of the TULIP_BQ_*
+    environment variables or the runtime config file changes. The config
+    file is only consulted while some of those variables are unset.
+    """
+    global _bigquery_config_cache
     
-    return {
+    env = tuple(os.environ.get(name) for name in _BIGQUERY_ENV_VARS)
+    
+    # When every variable is set the config file cannot contribute anything,
+    # so the env snapshot alone keys the cache and the file is not even stat'ed
+    runtime = _load_runtime_config_shared() if None in env else None
+    
+    cached = _bigquery_config_cache
+    if cached is not None and cached[0] == env and cached[1] is runtime:
+        return dict(cached[2])
+    
+    # Resolve from the snapshot; an env var (even empty) wins over the file
+    config = runtime if runtime is not None else {}
+    env_project, env_dataset_project, env_dataset, env_location = env
+    project = env_project if env_project is not None else config.get("bigquery_project", "")
+    dataset_project = (
+        env_dataset_project if env_dataset_project is not None
+        else config.get("bigquery_dataset_project", "")
+    )
+    
+    resolved = {
         "project": project,  # Project for authentication/billing
         "dataset_project": dataset_project if dataset_project else project,  # Project where dataset lives
-        "dataset": os.getenv("TULIP_BQ_DATASET", config.get("bigquery_dataset", "")),
-        "location": os.getenv("TULIP_BQ_LOCATION", config.get("bigquery_location", "EU")),
+        "dataset": env_dataset if env_dataset is not None else config.get("bigquery_dataset", ""),
+        "location": env_location if env_location is not None else config.get("bigquery_location", "EU"),
     }
+    _bigquery_config_cache = (env, runtime, resolved)
+    return dict(resolved)
 
 
-def validate_bigquery_config() -> tuple[bool, str]:
+@functools.lru_cache(maxsize=1)
+def get_bq_client(project: str):
     """
-    Validate BigQuery configuration is complete.
+    Get a shared BigQuery client for the given billing project.
+    
+    Client construction resolves Application Default Credentials and sets up
+    the HTTP transport, so the client is created once and reused.
+    """
+    from google.cloud import bigquery
+    
+    return bigquery.Client(project=project)
+
+
+@functools.lru_cache(maxsize=1)
+def get_bqstorage_client():
+    """
+    Get a shared BigQuery Storage Read API client, if installed.
+    
+    The Storage Read API streams results as Arrow record batches over gRPC,
+    which is much faster than the REST row listing for large results.
+    Install with: pip install "tulip-mcp[storage]"
     
     Returns:
-        Tuple of (is_valid, message)
+        BigQueryReadClient, or None if google-cloud-bigquery-storage is missing
     """
-    config = get_bigquery_config()
+    try:
+        from google.cloud import bigquery_storage
+    except ImportError:
+        return None
     
+    return bigquery_storage.BigQueryReadClient()
+
+
+def _check_bigquery_config(config: dict) -> tuple[bool, str]:
+    """Check an already-resolved BigQuery configuration for completeness."""
     if not config["project"]:
         return False, "TULIP_BQ_PROJECT environment variable not set"
     
@@ -371,6 +820,27 @@ def validate_bigquery_config() -> tuple[bool, str]:
     return True, f"BigQuery configured: {config['project']}.{config['dataset']}"
 
 
+def validate_bigquery_config() -> tuple[bool, str]:
+    """
+    Validate BigQuery configuration is complete.
+    
+    Returns:
+        Tuple of (is_valid, message)
+    """
+    return _check_bigquery_config(get_bigquery_config())
+
+
+def get_bigquery_config_with_validation() -> tuple[dict, bool, str]:
+    """
+    Resolve and validate the BigQuery configuration in one pass.
+    
+    Returns:
+        Tuple of (config, is_valid, message)
+    """
+    config = get_bigquery_config()
+    return (config, *_check_bigquery_config(config))
+
+
 # -------------------------------------------------------------------
 # Security Configuration
 # -------------------------------------------------------------------
@@ -380,7 +850,7 @@ MAX_QUERY_ROWS = 1000
 
 # Columns that should never be exposed in raw form (additional protection)
 # These are already de-identified in AmsterdamUMCdb, but we add extra protection
-SENSITIVE_COLUMN_PATTERNS = [
+SENSITIVE_COLUMN_PATTERNS = (
     "name",
     "address", 
     "phone",
@@ -390,10 +860,10 @@ SENSITIVE_COLUMN_PATTERNS = [
     "mrn",
     "medical_record",
     "insurance",
-]
+)
 
 # Query patterns that could potentially be used for re-identification
-REIDENTIFICATION_RISK_PATTERNS = [
+REIDENTIFICATION_RISK_PATTERNS = (
     # Direct identifier searches
     r"where\s+.*\s*=\s*['\"].*['\"]",  # Searching for specific string values
     # Uniqueness attacks
@@ -402,19 +872,55 @@ REIDENTIFICATION_RISK_PATTERNS = [
     r"(min|max)\s*\(\s*(age|year_of_birth)\s*\)",
     # Small group attacks
     r"group\s+by.*having\s+count\s*\(\s*\*\s*\)\s*<\s*\d+",
-]
+)
 
 # Minimum aggregation size for grouped results (k-anonymity protection)
 MIN_GROUP_SIZE = 5
 
+# Upper bound on bytes a single query may bill; BigQuery fails the job
+# instead of scanning more. Override with TULIP_BQ_MAX_BYTES_BILLED.
+MAX_BYTES_BILLED = int(os.getenv("TULIP_BQ_MAX_BYTES_BILLED", str(100 * 10**9)))
 
-def get_security_config() -> dict:
-    """Get security-related configuration."""
-    return {
-        "max_query_rows": MAX_QUERY_ROWS,
-        "sensitive_column_patterns": SENSITIVE_COLUMN_PATTERNS,
-        "reidentification_risk_patterns": REIDENTIFICATION_RISK_PATTERNS,
-        "min_group_size": MIN_GROUP_SIZE,
-        "enforce_datathon_period": True,
-    }
+# BigQuery-side time limit for search_by_source_text jobs. Substring searches
+# scan the whole column; past this BigQuery cancels the job rather than
+# leaving the tool call hanging. Override with TULIP_BQ_SEARCH_TIMEOUT_MS.
+SEARCH_JOB_TIMEOUT_MS = int(os.getenv("TULIP_BQ_SEARCH_TIMEOUT_MS", "30000"))
+
+# Job priority for the prebuilt aggregate tools. BATCH jobs do not count
+# towards the interactive concurrency quota but may queue before starting,
+# so they are opt-in: TULIP_BQ_AGGREGATE_PRIORITY=BATCH
+def _parse_query_priority(value: str) -> str:
+    """
+    Normalize a job priority setting, falling back to INTERACTIVE.
+    
+    An unknown value would otherwise only surface as a BigQuery error on
+    every aggregate tool call.
+    """
+    priority = value.strip().upper()
+    if priority not in ("INTERACTIVE", "BATCH"):
+        logger.warning(
+            f"Unknown TULIP_BQ_AGGREGATE_PRIORITY {value!r} (expected INTERACTIVE or BATCH); "
+            "using INTERACTIVE"
+        )
+        return "INTERACTIVE"
+    return priority
+
+
+AGGREGATE_QUERY_PRIORITY = _parse_query_priority(os.getenv("TULIP_BQ_AGGREGATE_PRIORITY", "INTERACTIVE"))
+
+
+# Built once and shared read-only; callers that need to modify it can copy
+# it with dict(get_security_config())
+_SECURITY_CONFIG = types.MappingProxyType({
+    "max_query_rows": MAX_QUERY_ROWS,
+    "sensitive_column_patterns": SENSITIVE_COLUMN_PATTERNS,
+    "reidentification_risk_patterns": REIDENTIFICATION_RISK_PATTERNS,
+    "min_group_size": MIN_GROUP_SIZE,
+    "enforce_datathon_period": True,
+})
+
+
+def get_security_config() -> Mapping:
+    """Get security-related configuration (read-only)."""
+    return _SECURITY_CONFIG
 
@@ -17,42 +17,160 @@ EULA COMPLIANCE:
 - All code is open source and available
 """
 
+import asyncio
+import functools
+import hashlib
+import io
+import itertools
 import os
+import re
+import threading
 import time
-from pathlib import Path
+from datetime import datetime, timezone
 
-import sqlparse
 from fastmcp import FastMCP
 
+try:
+    from google.cloud import bigquery
+except ImportError:  # reported when the server starts (see _init_bigquery)
+    bigquery = None
+
+from tulip.cache import TTLCache
 from tulip.config import (
+    AGGREGATE_QUERY_PRIORITY,
     APP_NAME,
     DATABASE_NAME,
     DATATHON_NAME,
     FULL_NAME,
+    MAX_BYTES_BILLED,
     MAX_QUERY_ROWS,
+    MIN_GROUP_SIZE,
+    SEARCH_JOB_TIMEOUT_MS,
     UMCDB_TABLES,
     get_bigquery_config,
     get_bigquery_table_path,
+    get_bqstorage_client,
     get_datathon_period_status,
     get_table_info as get_table_info_config,
-    is_within_datathon_period,
     logger,
     validate_bigquery_config,
 )
 from tulip.security import (
+    check_result_summary_privacy,
     enforce_security,
+    enforce_trusted_query,
     get_security_status,
     log_query_execution,
+    normalize_sql,
     sanitize_error_for_user,
-    check_result_privacy,
 )
 
 # Create FastMCP server instance
 mcp = FastMCP(APP_NAME)
 
-# Global BigQuery client
+# Global BigQuery client and the config it was initialized with
 _bq_client = None
 _bq_project = None
+_bq_config = None
+
+# Formatted results of recent queries, keyed by a hash of the normalized SQL.
+# Tool calls during an LLM session repeat the same schema/statistics queries,
+# so a short TTL serves those without another BigQuery job.
+_query_cache = TTLCache(maxsize=256, ttl=300)
+
+# Cache keys of queries currently running in BigQuery -> set when they finish.
+# Identical calls that arrive meanwhile (LLM retries) wait and read the
+# cache instead of starting a duplicate job.
+_inflight_queries: dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+# Waiters hold a query slot, so they give up after this long and run the
+# query themselves rather than starving unrelated tool calls
+_INFLIGHT_WAIT_SECONDS = 5.0
+
+# Dataset table list and per-table columns, keyed by dataset so a config
+# change never serves another dataset's schema. Refreshed every 15 minutes.
+_schema_cache = TTLCache(maxsize=128, ttl=900)
+
+# Queries whose results depend on when or by whom they run are never cached
+# (the same exclusions BigQuery applies to its own result cache)
+_VOLATILE_SQL_RE = re.compile(
+    r"\b(CURRENT_(DATE|TIME|TIMESTAMP|DATETIME)|SESSION_USER|RAND|GENERATE_UUID)\b",
+    re.IGNORECASE,
+)
+
+
+# Trailing "HAVING COUNT(*) >= N" / "HAVING COUNT(DISTINCT person_id) >= N"
+# clause of a grouped template (no other clause may follow except ORDER BY/LIMIT)
+_HAVING_MIN_GROUP_RE = re.compile(
+    r"\bHAVING\s+COUNT\s*\(\s*(?:\*|DISTINCT\s+person_id)\s*\)\s*>=\s*(\d+)\s*"
+    r"(?:ORDER\s+BY\s+\w+(?:\s+(?:ASC|DESC))?\s*)?(?:LIMIT\s+(?:\d+|@\w+)\s*)?$",
+    re.IGNORECASE,
+)
+
+# Table and column names interpolated into tool SQL (identifiers cannot be
+# query parameters, so anything else is rejected)
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Statements and comment markers rejected in search_by_source_text filters
+_DANGEROUS_FILTER_RE = re.compile(
+    r"\b(?:DROP|DELETE|INSERT|UPDATE|TRUNCATE|MERGE|ALTER|CREATE)\b|--|/\*|;",
+    re.IGNORECASE,
+)
+
+# BigQuery jobs this server runs at once (see _run_query)
+_MAX_CONCURRENT_QUERIES = 4
+_query_slots = asyncio.Semaphore(_MAX_CONCURRENT_QUERIES)
+
+# Rows shown in a tool response; larger results are summarized by row count
+DISPLAY_ROWS = 50
+
+# Results with at least this many rows are downloaded through the BigQuery
+# Storage Read API (when installed); below it the REST listing is faster
+_BQSTORAGE_MIN_ROWS = 10_000
+
+# Server-side SQL templates that passed full validation -> tables accessed
+_validated_templates: dict[str, list[str]] = {}
+
+
+def _query_cache_key(sql_query: str, params: list[tuple] | None = None) -> str | None:
+    """Cache key for a query and its parameters, or None if it must not be cached."""
+    if _VOLATILE_SQL_RE.search(sql_query):
+        return None
+    key = normalize_sql(sql_query)
+    if params:
+        key += "\0" + repr(params)
+    return hashlib.blake2b(key.encode()).hexdigest()
+
+
+def _claim_query(cache_key: str) -> threading.Event | None:
+    """
+    Register the caller as the one running a query, unless an identical
+    query is already running.
+    
+    Returns:
+        An event to set once the query finishes (the caller runs it), or
+        None after an identical in-flight query has finished (check the
+        cache again). If that query takes longer than
+        _INFLIGHT_WAIT_SECONDS, an unregistered event is returned and the
+        caller runs its own copy.
+    """
+    with _inflight_lock:
+        running = _inflight_queries.get(cache_key)
+        if running is None:
+            claim = _inflight_queries[cache_key] = threading.Event()
+            return claim
+    if running.wait(timeout=_INFLIGHT_WAIT_SECONDS):
+        return None
+    return threading.Event()
+
+
+def _release_query(cache_key: str, claim: threading.Event) -> None:
+    """Mark a claimed query as finished and wake any identical callers."""
+    with _inflight_lock:
+        if _inflight_queries.get(cache_key) is claim:
+            del _inflight_queries[cache_key]
+    claim.set()
 
 
 def _validate_limit(limit: int) -> bool:
@@ -62,11 +180,9 @@ def _validate_limit(limit: int) -> bool:
 
 def _init_bigquery():
     """Initialize BigQuery client."""
-    global _bq_client, _bq_project
+    global _bq_client, _bq_project, _bq_config
     
-    try:
-        from google.cloud import bigquery
-    except ImportError:
+    if bigquery is None:
         raise ImportError(
             "BigQuery dependencies not found. Install with: pip install google-cloud-bigquery"
         )
@@ -81,16 +197,51 @@ def _init_bigquery():
     _bq_project = config["project"]
     
     try:
-        _bq_client = bigquery.Client(project=_bq_project)
+        # Every query job starts from these defaults (per-call configs are
+        # merged over them), so no config object is rebuilt per query
+        default_job_config = bigquery.QueryJobConfig(
+            use_query_cache=True,
+            maximum_bytes_billed=MAX_BYTES_BILLED,
+            labels={"app": APP_NAME},
+        )
+        # Jobs run in the dataset's location unless a call says otherwise
+        _bq_client = bigquery.Client(
+            project=_bq_project,
+            location=config.get("location", "EU"),
+            default_query_job_config=default_job_config,
+        )
         logger.info(f"BigQuery client initialized for project: {_bq_project}")
     except Exception as e:
         logger.error(f"Failed to initialize BigQuery client: {e}")
         raise RuntimeError(f"BigQuery initialization failed: {e}")
+    
+    _bq_config = config
+
+
+def _get_config() -> dict:
+    """
+    BigQuery config for tool calls.
+    
+    The client is bound to the project resolved at startup, so tools reuse
+    that config instead of resolving it again on every call.
+    """
+    return _bq_config if _bq_config is not None else get_bigquery_config()
 
 
 def _get_status_banner() -> str:
     """Get a status banner with system information."""
-    config = get_bigquery_config()
+    return _status_banner_for_minute(int(time.time() // 60))
+
+
+@functools.lru_cache(maxsize=1)
+def _status_banner_for_minute(minute: int) -> str:
+    """
+    Render the status banner once per wall-clock minute.
+    
+    Every tool response starts with the banner, and its content (datathon
+    status, configured project) changes at minute granularity at most.
+    """
+    config = _get_config()
     datathon_status = get_datathon_period_status()
     
     return f"""🌷 **{FULL_NAME} ({APP_NAME.upper()})**
@@ -106,19 +257,40 @@ def _get_status_banner() -> str:
 # INTERNAL QUERY EXECUTION FUNCTIONS
 # ==========================================
 
-def _execute_bigquery_query(sql_query: str) -> str:
+def _execute_bigquery_query(
+    sql_query: str,
+    template: str | None = None,
+    params: list[tuple] | None = None,
+    priority: str | None = None,
+) -> str:
     """
     Execute BigQuery query with security enforcement.
     
     SECURITY: This function enforces all security policies before
     executing any query against the database.
+    
+    Args:
+        sql_query: SQL to execute
+        template: Name of the server-side SQL template the query was built
+            from. Templates are fully validated on first use; later calls
+            only go through rate limiting and EULA checks.
+        params: Query parameters as (name, type, value) tuples, referenced
+            in the SQL as @name. Keeping values out of the SQL text lets
+            BigQuery serve repeat calls from its result cache.
+        priority: Job priority ("INTERACTIVE" or "BATCH"); default INTERACTIVE
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     tables_accessed = []
+    cache_key = claim = None
     
     try:
         # Security enforcement (includes rate limiting, validation, etc.)
-        is_safe, message, tables_accessed = enforce_security(sql_query)
+        if template in _validated_templates:
+            is_safe, message, tables_accessed = enforce_trusted_query(_validated_templates[template])
+        else:
+            is_safe, message, tables_accessed = enforce_security(sql_query)
+            if is_safe and template is not None:
+                _validated_templates[template] = list(tables_accessed)
         if not is_safe:
             log_query_execution(
                 query=sql_query,
@@ -129,19 +301,59 @@ def _execute_bigquery_query(sql_query: str) -> str:
             )
             return f"❌ **Security Error:** {message}"
         
+        # Serve repeated queries from the cache (still rate limited and audited)
+        cache_key = _query_cache_key(sql_query, params)
+        if cache_key is not None:
+            cached = _query_cache.get(cache_key)
+            # Wait out an identical running query; if it produced no cached
+            # result (it failed), this call runs the query itself
+            while cached is None:
+                claim = _claim_query(cache_key)
+                if claim is not None:
+                    break
+                cached = _query_cache.get(cache_key)
+            if cached is not None:
+                log_query_execution(
+                    query=sql_query,
+                    tables=tables_accessed,
+                    query_type="SELECT",
+                    success=True,
+                    execution_time_ms=(time.perf_counter() - start_time) * 1000,
+                    cache_hit=True,
+                )
+                return cached
+        
         # Execute query
-        from google.cloud import bigquery
+        # Cache use and the bytes cap come from the client's default job
+        # config; a per-call config is only built for parameters or priority
+        job_config = None
+        if params or priority:
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter(name, type_, value) for name, type_, value in params or ()
+                ],
+                priority=priority,
+            )
+        # query_and_wait uses the jobs.query RPC, which returns the first page
+        # of results with the job itself when the query finishes quickly
+        rows = _bq_client.query_and_wait(sql_query, job_config=job_config)
         
-        config = get_bigquery_config()
-        job_config = bigquery.QueryJobConfig()
-        location = config.get("location", "EU")  # Set dataset location
-        query_job = _bq_client.query(sql_query, job_config=job_config, location=location)
-        df = query_job.to_dataframe()
+        # Server templates whose SQL already drops small groups skip the
+        # row-level privacy scan; user SQL is always checked
+        groups_enforced = template is not None and _enforces_min_group_size(sql_query)
+        columns, preview, total_rows, column_minimums = _collect_rows(
+            rows, track_counts=not groups_enforced
+        )
         
-        execution_time = (time.time() - start_time) * 1000
+        execution_time = (time.perf_counter() - start_time) * 1000
         
         # Check result privacy before returning
-        is_private, privacy_warning = check_result_privacy(df, sql_query)
+        if groups_enforced:
+            is_private, privacy_warning = True, ""
+        else:
+            is_private, privacy_warning = check_result_summary_privacy(
+                total_rows, columns, column_minimums, sql_query
+            )
         if not is_private:
             log_query_execution(
                 query=sql_query,
@@ -162,24 +374,24 @@ def _execute_bigquery_query(sql_query: str) -> str:
             execution_time_ms=execution_time,
         )
         
-        if df.empty:
-            return "No results found"
-        
-        # Format results
-        if len(df) > 50:
-            result = df.head(50).to_string(index=False)
-            result += f"\n... ({len(df)} total rows, showing first 50)"
+        if total_rows == 0:
+            result = "No results found"
         else:
-            result = df.to_string(index=False)
-        
-        # Add privacy warning if results are small
-        if len(df) < 10:
-            result += "\n\n⚠️ **Note:** Small result sets may have limited statistical significance."
+            # Format results
+            result = _format_rows(columns, preview)
+            if total_rows > DISPLAY_ROWS:
+                result += f"\n... ({total_rows} total rows, showing first {DISPLAY_ROWS})"
+            
+            # Add privacy warning if results are small
+            if total_rows < 10:
+                result += "\n\n⚠️ **Note:** Small result sets may have limited statistical significance."
         
+        if cache_key is not None:
+            _query_cache.set(cache_key, result)
         return result
     
     except Exception as e:
-        execution_time = (time.time() - start_time) * 1000
+        execution_time = (time.perf_counter() - start_time) * 1000
         error_msg = sanitize_error_for_user(str(e))
         
         log_query_execution(
@@ -192,40 +404,174 @@ def _execute_bigquery_query(sql_query: str) -> str:
         )
         
         return _format_error_with_guidance(error_msg)
+    
+    finally:
+        if claim is not None:
+            _release_query(cache_key, claim)
 
 
-def _format_error_with_guidance(error: str) -> str:
-    """Format error message with helpful guidance."""
-    error_lower = error.lower()
+@functools.lru_cache(maxsize=64)
+def _enforces_min_group_size(sql_query: str) -> bool:
+    """
+    Whether a query's final HAVING clause keeps only groups of at least
+    MIN_GROUP_SIZE (by COUNT(*) or COUNT(DISTINCT person_id)).
     
-    suggestions = []
+    Only meaningful for the server's own templates, whose structure is
+    known; user SQL could hide such a clause in a subquery.
+    """
+    match = _HAVING_MIN_GROUP_RE.search(sql_query)
+    return match is not None and int(match.group(1)) >= MIN_GROUP_SIZE
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking BigQuery call in a worker thread without blocking the event loop.
     
-    if "not found" in error_lower or "does not exist" in error_lower:
-        suggestions.append("🔍 Use `get_database_schema()` to see available tables")
-        suggestions.append("📋 Table names are case-sensitive in BigQuery")
+    At most _MAX_CONCURRENT_QUERIES run at once; further tool calls wait
+    for a slot instead of piling onto the project's BigQuery concurrency
+    quota (and getting rate-limit errors back).
+    """
+    async with _query_slots:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def _run_query(sql_query: str, **kwargs) -> str:
+    """Run _execute_bigquery_query through _run_blocking."""
+    return await _run_blocking(_execute_bigquery_query, sql_query, **kwargs)
+
+
+def _query_rows(sql_query: str, job_config=None) -> list:
+    """Run a query and read all of its (few) rows."""
+    return list(_bq_client.query_and_wait(sql_query, job_config=job_config))
+
+
+def _collect_rows(
+    rows,
+    max_rows: int = DISPLAY_ROWS,
+    track_counts: bool = True,
+) -> tuple[list[str], list[tuple], int, dict]:
+    """
+    Stream a BigQuery row iterator, keeping only what the tools need.
     
-    if "column" in error_lower:
-        suggestions.append("🔍 Use `get_table_info('table_name')` to see column names")
-        suggestions.append("📝 Column names follow OMOP CDM conventions")
+    Rows are consumed page by page; only the first max_rows are kept for
+    display, and the minimum of every "count" column is tracked for the
+    result privacy check, so no DataFrame of the full result is built.
     
-    if "syntax" in error_lower:
-        suggestions.append("📝 Check SQL syntax - BigQuery uses Standard SQL")
-        suggestions.append("💡 Try a simpler query first: `SELECT * FROM table LIMIT 5`")
+    Args:
+        rows: BigQuery RowIterator
+        max_rows: Number of leading rows to keep for display
+        track_counts: Track count column minimums (off when the SQL already
+            enforces the minimum group size)
     
-    if "permission" in error_lower or "access" in error_lower:
-        suggestions.append("🔐 Ensure your GCP credentials are configured correctly")
-        suggestions.append("📧 Contact datathon organizers if access issues persist")
+    Returns:
+        Tuple of (columns, preview_rows, total_rows, count_column_minimums)
+    """
+    # Unusually large results (e.g. a LIMIT only inside a subquery) are
+    # downloaded as Arrow through the Storage Read API when it is installed
+    if (rows.total_rows or 0) >= _BQSTORAGE_MIN_ROWS:
+        storage_client = get_bqstorage_client()
+        if storage_client is not None:
+            table = rows.to_arrow(bqstorage_client=storage_client, create_bqstorage_client=False)
+            return _collect_arrow(table, max_rows, track_counts)
     
-    if not suggestions:
-        suggestions.append("🔍 Use `get_database_schema()` to explore available data")
-        suggestions.append("📋 Use `get_table_info('table_name')` to understand table structure")
+    columns = [field.name for field in rows.schema]
+    count_columns = [
+        (i, name) for i, name in enumerate(columns) if track_counts and "count" in name.lower()
+    ]
+    column_minimums = dict.fromkeys(name for _, name in count_columns)
+    preview = []
+    total_rows = 0
     
-    suggestion_text = "\n".join(f"   {s}" for s in suggestions)
+    for row in rows:
+        if total_rows < max_rows:
+            preview.append(tuple(row.values()))
+        total_rows += 1
+        for i, name in count_columns:
+            value = row[i]
+            if value is not None and (column_minimums[name] is None or value < column_minimums[name]):
+                column_minimums[name] = value
     
-    return f"""❌ **Query Failed:** {error}
+    return columns, preview, total_rows, column_minimums
 
-🛠️ **How to fix this:**
-{suggestion_text}
+
+def _collect_arrow(table, max_rows: int, track_counts: bool) -> tuple[list[str], list[tuple], int, dict]:
+    """Same summary as _collect_rows, computed column-wise from an Arrow table."""
+    import pyarrow.compute as pc
+    
+    columns = table.column_names
+    head = table.slice(0, max_rows)
+    preview = list(zip(*(column.to_pylist() for column in head.columns)))
+    column_minimums = {
+        name: pc.min(table[name]).as_py()
+        for name in columns
+        if track_counts and "count" in name.lower()
+    }
+    return columns, preview, table.num_rows, column_minimums
+
+
+def _format_rows(columns: list[str], rows: list[tuple], max_rows: int = DISPLAY_ROWS) -> str:
+    """
+    Render rows as a right-aligned plain-text table.
+    
+    Cells are converted to text once and column widths are computed in the
+    same pass, so the preview never goes through pandas' formatter.
+    """
+    cells = [[str(value) for value in row] for row in itertools.islice(rows, max_rows)]
+    widths = [len(name) for name in columns]
+    for row in cells:
+        for i, cell in enumerate(row):
+            if len(cell) > widths[i]:
+                widths[i] = len(cell)
+    
+    out = io.StringIO()
+    out.write("  ".join(f"{name:>{w}}" for name, w in zip(columns, widths)))
+    for row in cells:
+        out.write("\n")
+        out.write("  ".join(f"{cell:>{w}}" for cell, w in zip(row, widths)))
+    return out.getvalue()
+
+
+# Error keywords -> suggestion group, and the groups in display order
+_ERROR_KEYWORD_GROUPS = {
+    "not found": "missing",
+    "does not exist": "missing",
+    "column": "column",
+    "syntax": "syntax",
+    "permission": "access",
+    "access": "access",
+    "bytes billed": "scan",
+}
+_ERROR_KEYWORD_RE = re.compile("|".join(_ERROR_KEYWORD_GROUPS), re.IGNORECASE)
+_ERROR_SUGGESTIONS = {
+    "missing": (
+        "🔍 Use `get_database_schema()` to see available tables",
+        "📋 Table names are case-sensitive in BigQuery",
+    ),
+    "column": (
+        "🔍 Use `get_table_info('table_name')` to see column names",
+        "📝 Column names follow OMOP CDM conventions",
+    ),
+    "syntax": (
+        "📝 Check SQL syntax - BigQuery uses Standard SQL",
+        "💡 Try a simpler query first: `SELECT * FROM table LIMIT 5`",
+    ),
+    "access": (
+        "🔐 Ensure your GCP credentials are configured correctly",
+        "📧 Contact datathon organizers if access issues persist",
+    ),
+    # BigQuery rejects jobs over maximum_bytes_billed before running (and billing) them
+    "scan": (
+        f"📉 The query would scan more than {MAX_BYTES_BILLED / 10**9:g} GB - filter by concept ID or date range",
+        "💡 Select only the columns you need; `SELECT *` on `measurement` scans every column",
+    ),
+}
+_DEFAULT_ERROR_SUGGESTIONS = (
+    "🔍 Use `get_database_schema()` to explore available data",
+    "📋 Use `get_table_info('table_name')` to understand table structure",
+)
+
+# Everything after the suggestions is the same for every error
+_ERROR_RECOVERY_FOOTER = f"""
 
 🎯 **Quick Recovery Steps:**
 1. `get_database_schema()` ← See what tables exist
@@ -235,12 +581,174 @@ def _format_error_with_guidance(error: str) -> str:
 📚 **Database:** {DATABASE_NAME} (OMOP CDM format)"""
 
 
+@functools.lru_cache(maxsize=32)
+def _suggestion_text(groups: frozenset) -> str:
+    """Render the suggestion lines for a set of matched keyword groups."""
+    suggestions = [s for group, texts in _ERROR_SUGGESTIONS.items() if group in groups for s in texts]
+    return "\n".join(f"   {s}" for s in suggestions or _DEFAULT_ERROR_SUGGESTIONS)
+
+
+def _format_error_with_guidance(error: str) -> str:
+    """Format error message with helpful guidance."""
+    # One scan for all keywords; suggestions keep their fixed group order
+    groups = frozenset(_ERROR_KEYWORD_GROUPS[match.lower()] for match in _ERROR_KEYWORD_RE.findall(error))
+    
+    return f"""❌ **Query Failed:** {error}
+
+🛠️ **How to fix this:**
+{_suggestion_text(groups)}{_ERROR_RECOVERY_FOOTER}"""
+
+
+# ==========================================
+# AGGREGATE TOOL SQL TEMPLATES
+# ==========================================
+
+# The aggregate tools only fill in table paths; limits and filters are bound
+# as query parameters. The SQL text is therefore constant per dataset, so each
+# template is security-validated once (see _execute_bigquery_query) and
+# BigQuery can answer repeats from its result cache.
+
+_DEMOGRAPHICS_SQL = """
+    SELECT 
+        gender_concept_id,
+        COUNT(*) as patient_count,
+        AVG(EXTRACT(YEAR FROM @today) - year_of_birth) as avg_age
+    FROM {person}
+    GROUP BY gender_concept_id
+    HAVING COUNT(*) >= 5
+    ORDER BY patient_count DESC
+    LIMIT @lim
+    """
+
+_MEASUREMENT_STATS_SQL = """
+    SELECT 
+        measurement_concept_id,
+        COUNT(*) as n_observations,
+        AVG(value_as_number) as mean_value,
+        STDDEV(value_as_number) as std_value,
+        MIN(value_as_number) as min_value,
+        MAX(value_as_number) as max_value,
+        APPROX_QUANTILES(value_as_number, 2)[OFFSET(1)] as median_value
+    FROM {measurement}
+    {where}
+    GROUP BY measurement_concept_id
+    HAVING COUNT(*) >= 10
+    ORDER BY n_observations DESC
+    LIMIT @lim
+    """
+
+_DRUG_EXPOSURE_SQL = """
+    SELECT 
+        drug_concept_id,
+        COUNT(*) as n_exposures,
+        COUNT(DISTINCT person_id) as n_patients,
+        AVG(TIMESTAMP_DIFF(drug_exposure_end_datetime, drug_exposure_start_datetime, HOUR)) as avg_duration_hours
+    FROM {drug_exposure}
+    GROUP BY drug_concept_id
+    HAVING COUNT(DISTINCT person_id) >= 5
+    ORDER BY n_exposures DESC
+    LIMIT @lim
+    """
+
+_CONDITION_PREVALENCE_SQL = """
+    SELECT 
+        condition_concept_id,
+        COUNT(*) as n_occurrences,
+        COUNT(DISTINCT person_id) as n_patients
+    FROM {condition_occurrence}
+    GROUP BY condition_concept_id
+    HAVING COUNT(DISTINCT person_id) >= 5
+    ORDER BY n_patients DESC
+    LIMIT @lim
+    """
+
+_MORTALITY_SQL = """
+    WITH mortality AS (
+        SELECT 
+            p.person_id,
+            p.gender_concept_id,
+            CASE 
+                WHEN d.person_id IS NOT NULL THEN 1 
+                ELSE 0 
+            END as died
+        FROM {person} p
+        LEFT JOIN {death} d ON p.person_id = d.person_id
+    )
+    SELECT 
+        gender_concept_id,
+        COUNT(*) as total_patients,
+        SUM(died) as deaths,
+        ROUND(100.0 * SUM(died) / COUNT(*), 2) as mortality_rate_pct
+    FROM mortality
+    GROUP BY gender_concept_id
+    HAVING COUNT(*) >= 10
+    ORDER BY total_patients DESC
+    LIMIT 100
+    """
+
+
+@functools.lru_cache(maxsize=32)
+def _render_template(template_sql: str, **fields: str) -> str:
+    """
+    Fill a template's table paths once per dataset.
+    
+    Returning the same string object on every call also lets the downstream
+    caches keyed on the SQL text (normalization, group-size check) hit
+    without rehashing it.
+    """
+    return template_sql.format(**fields)
+
+
 # ==========================================
 # MCP TOOLS - PUBLIC API
 # ==========================================
 
+def _dataset_tables_text(dataset_project: str, dataset: str) -> tuple[int, str]:
+    """
+    List the dataset's tables as (count, formatted list), cached for a while.
+    
+    The table list only changes when organizers reload the dataset, so the
+    INFORMATION_SCHEMA query and the formatting run at most once per TTL.
+    """
+    cache_key = ("tables", dataset_project, dataset)
+    cached = _schema_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    schema_query = f"""
+    SELECT table_name 
+    FROM `{dataset_project}`.`{dataset}`.INFORMATION_SCHEMA.TABLES
+    WHERE table_type = 'BASE TABLE'
+    ORDER BY table_name
+    """
+    
+    result = _bq_client.query_and_wait(schema_query)
+    
+    try:
+        # Decode the column in bulk through Arrow instead of one Row at a time
+        actual_tables = result.to_arrow(
+            bqstorage_client=get_bqstorage_client(), create_bqstorage_client=False
+        ).column("table_name").to_pylist()
+    except ImportError:
+        # pyarrow missing - fall back to row iteration
+        actual_tables = [row.table_name for row in result]
+    
+    # Build simple table list - no hardcoded descriptions
+    table_list = []
+    for table_name in actual_tables:
+        # Optional: add description if we have it in config, but don't require it
+        if table_name in UMCDB_TABLES:
+            table_list.append(f"📋 **{table_name}** - {UMCDB_TABLES[table_name]['description']}")
+        else:
+            table_list.append(f"📋 **{table_name}**")
+    
+    tables = (len(actual_tables), "\n".join(table_list))
+    _schema_cache.set(cache_key, tables)
+    return tables
+
+
 @mcp.tool()
-def get_database_schema() -> str:
+async def get_database_schema() -> str:
     """🔍 Discover what data is available in AmsterdamUMCdb.
 
     **When to use:** Start here to understand what tables exist and what data you can query.
@@ -264,35 +772,15 @@ def get_database_schema() -> str:
     
     try:
         # Query BigQuery to get ACTUAL tables in the dataset
-        config = get_bigquery_config()
+        config = _get_config()
         dataset_project = config.get("dataset_project", config["project"])
         
-        schema_query = f"""
-        SELECT table_name 
-        FROM `{dataset_project}`.`{config['dataset']}`.INFORMATION_SCHEMA.TABLES
-        WHERE table_type = 'BASE TABLE'
-        ORDER BY table_name
-        """
-        
-        from google.cloud import bigquery
-        client = bigquery.Client(project=config["project"], location=config.get("location", "EU"))
-        result = client.query(schema_query, location=config.get("location", "EU")).result()
-        
-        actual_tables = [row.table_name for row in result]
-        
-        # Build simple table list - no hardcoded descriptions
-        table_list = []
-        for table_name in actual_tables:
-            # Optional: add description if we have it in config, but don't require it
-            if table_name in UMCDB_TABLES:
-                table_list.append(f"📋 **{table_name}** - {UMCDB_TABLES[table_name]['description']}")
-            else:
-                table_list.append(f"📋 **{table_name}**")
-        
-        tables_text = "\n".join(table_list)
+        table_count, tables_text = await _run_blocking(
+            _dataset_tables_text, dataset_project, config["dataset"]
+        )
         
         return f"""{banner}
-📊 **Available Tables in Dataset ({len(actual_tables)} tables):**
+📊 **Available Tables in Dataset ({table_count} tables):**
 
 {tables_text}
 💡 **Next:** Pick ONE relevant table and call `get_table_info('table_name', show_sample=false)`.
@@ -316,8 +804,37 @@ def get_database_schema() -> str:
 ⚠️ Could not query live schema. Use `get_table_info('table_name')` to verify table exists."""
 
 
+# Legacy type names reported by the tables API -> GoogleSQL names used in queries
+_GOOGLESQL_TYPE_NAMES = {"INTEGER": "INT64", "FLOAT": "FLOAT64", "BOOLEAN": "BOOL", "RECORD": "STRUCT"}
+
+
+def _table_columns(dataset_project: str, dataset: str, table_name: str) -> tuple[tuple[str, str, str], ...]:
+    """
+    Get (column_name, data_type, is_nullable) for a table, cached for a while.
+    
+    Uses the tables.get metadata call instead of querying
+    INFORMATION_SCHEMA.COLUMNS, so no query job runs and nothing is billed.
+    """
+    cache_key = ("columns", dataset_project, dataset, table_name)
+    cached = _schema_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    table = _bq_client.get_table(f"{dataset_project}.{dataset}.{table_name}")
+    columns = tuple(
+        (
+            field.name,
+            _GOOGLESQL_TYPE_NAMES.get(field.field_type, field.field_type),
+            "NO" if field.mode == "REQUIRED" else "YES",
+        )
+        for field in table.schema
+    )
+    _schema_cache.set(cache_key, columns)
+    return columns
+
+
 @mcp.tool()
-def get_table_info(table_name: str, show_sample: bool = True) -> str:
+async def get_table_info(table_name: str, show_sample: bool = True) -> str:
     """📋 Explore a specific table's structure and see sample data.
 
     **When to use:** After identifying a table of interest from `get_database_schema()`.
@@ -339,30 +856,27 @@ def get_table_info(table_name: str, show_sample: bool = True) -> str:
     **Privacy Note:** Sample data shows de-identified records only.
     """
     # Get optional description from config (if available)
-    info = get_table_info_config(table_name.lower()) if table_name.lower() in UMCDB_TABLES else None
+    info = get_table_info_config(table_name)
 
     banner = _get_status_banner()
     
     try:
-        full_table_path = get_bigquery_table_path(table_name.lower())
+        config = _get_config()
+        full_table_path = get_bigquery_table_path(table_name.lower(), config)
         
-        # Get column information from BigQuery
-        config = get_bigquery_config()
+        # Get column information from BigQuery table metadata
         dataset_project = config.get("dataset_project", config["project"])
         
-        # Note: INFORMATION_SCHEMA must use the backtick-per-component format
-        schema_query = f"""
-        SELECT column_name, data_type, is_nullable
-        FROM `{dataset_project}`.`{config['dataset']}`.INFORMATION_SCHEMA.COLUMNS
-        WHERE table_name = '{table_name.lower()}'
-        ORDER BY ordinal_position
-        LIMIT 100
-        """
+        # Fetch the schema and the sample rows concurrently; both wait on
+        # BigQuery round trips, so their latencies overlap
+        lookups = [_run_blocking(_table_columns, dataset_project, config["dataset"], table_name.lower())]
+        if show_sample:
+            sample_query = f"SELECT * FROM {full_table_path} LIMIT 3"
+            lookups.append(_run_query(sample_query))
+        columns, *sample = await asyncio.gather(*lookups, return_exceptions=True)
         
-        # Security check for schema query
-        is_safe, msg, _ = enforce_security(schema_query)
-        if not is_safe:
-            # Fallback - show minimal info if schema query fails
+        if isinstance(columns, Exception):
+            # Fallback - show minimal info if the schema lookup fails
             desc = info['description'] if info else "OMOP CDM table"
             result = f"""{banner}
 📋 **Table:** {full_table_path}
@@ -371,11 +885,10 @@ def get_table_info(table_name: str, show_sample: bool = True) -> str:
 
 **To query this table, use:** {full_table_path}
 
-⚠️ Could not fetch live schema: {msg}"""
+⚠️ Could not fetch live schema: {sanitize_error_for_user(str(columns))}"""
             return result
         
-        # Execute schema query
-        schema_result = _execute_bigquery_query(schema_query)
+        schema_result = _format_rows(["column_name", "data_type", "is_nullable"], list(columns), len(columns))
         
         # Build result with optional description
         desc = info['description'] if info else "OMOP CDM table"
@@ -397,8 +910,7 @@ def get_table_info(table_name: str, show_sample: bool = True) -> str:
             result += f"\n**Notes:** {notes}\n"
         
         if show_sample:
-            sample_query = f"SELECT * FROM {full_table_path} LIMIT 3"
-            sample_result = _execute_bigquery_query(sample_query)
+            sample_result = sample[0]
             result += f"""
 📊 **Sample Data (3 rows):**
 {sample_result}
@@ -419,7 +931,7 @@ def get_table_info(table_name: str, show_sample: bool = True) -> str:
 
 
 @mcp.tool()
-def execute_umcdb_query(sql_query: str) -> str:
+async def execute_umcdb_query(sql_query: str) -> str:
     """🚀 Execute SQL queries to analyze AmsterdamUMCdb data.
 
     **💡 Pro tip:** For best results, explore the database structure first!
@@ -450,11 +962,11 @@ def execute_umcdb_query(sql_query: str) -> str:
     Returns:
         Query results or helpful error messages with next steps
     """
-    return _execute_bigquery_query(sql_query)
+    return await _run_query(sql_query)
 
 
 @mcp.tool()
-def get_patient_demographics(limit: int = 100) -> str:
+async def get_patient_demographics(limit: int = 100) -> str:
     """👥 Get aggregated patient demographics from AmsterdamUMCdb.
 
     **What this does:** Returns aggregated demographic statistics.
@@ -471,22 +983,18 @@ def get_patient_demographics(limit: int = 100) -> str:
     if not _validate_limit(limit):
         return f"Error: Invalid limit. Must be between 1 and {MAX_QUERY_ROWS}."
     
-    config = get_bigquery_config()
-    table_path = f"`{config['project']}.{config['dataset']}.person`"
-    
-    query = f"""
-    SELECT 
-        gender_concept_id,
-        COUNT(*) as patient_count,
-        AVG(EXTRACT(YEAR FROM CURRENT_DATE()) - year_of_birth) as avg_age
-    FROM {table_path}
-    GROUP BY gender_concept_id
-    HAVING COUNT(*) >= 5
-    ORDER BY patient_count DESC
-    LIMIT {limit}
-    """
-    
-    result = _execute_bigquery_query(query)
+    # Pin "today" to the UTC date so the query text and parameters (and thus
+    # BigQuery's cached result) stay the same for the whole day
+    query = _render_template(_DEMOGRAPHICS_SQL, person=get_bigquery_table_path("person", _get_config()))
+    result = await _run_query(
+        query,
+        template="demographics",
+        priority=AGGREGATE_QUERY_PRIORITY,
+        params=[
+            ("today", "DATE", datetime.now(timezone.utc).date()),
+            ("lim", "INT64", limit),
+        ],
+    )
     
     return f"""👥 **Patient Demographics (Aggregated)**
 
@@ -499,7 +1007,7 @@ def get_patient_demographics(limit: int = 100) -> str:
 
 
 @mcp.tool()
-def get_measurement_statistics(
+async def get_measurement_statistics(
     measurement_concept_id: int | None = None,
     limit: int = 50
 ) -> str:
@@ -523,31 +1031,23 @@ def get_measurement_statistics(
     if not _validate_limit(limit):
         return f"Error: Invalid limit. Must be between 1 and {MAX_QUERY_ROWS}."
     
-    config = get_bigquery_config()
-    table_path = f"`{config['project']}.{config['dataset']}.measurement`"
-    
+    params = [("lim", "INT64", limit)]
     where_clause = ""
     if measurement_concept_id:
-        where_clause = f"WHERE measurement_concept_id = {measurement_concept_id}"
+        where_clause = "WHERE measurement_concept_id = @mcid"
+        params.append(("mcid", "INT64", measurement_concept_id))
     
-    query = f"""
-    SELECT 
-        measurement_concept_id,
-        COUNT(*) as n_observations,
-        AVG(value_as_number) as mean_value,
-        STDDEV(value_as_number) as std_value,
-        MIN(value_as_number) as min_value,
-        MAX(value_as_number) as max_value,
-        APPROX_QUANTILES(value_as_number, 2)[OFFSET(1)] as median_value
-    FROM {table_path}
-    {where_clause}
-    GROUP BY measurement_concept_id
-    HAVING COUNT(*) >= 10
-    ORDER BY n_observations DESC
-    LIMIT {limit}
-    """
-    
-    result = _execute_bigquery_query(query)
+    query = _render_template(
+        _MEASUREMENT_STATS_SQL,
+        measurement=get_bigquery_table_path("measurement", _get_config()),
+        where=where_clause,
+    )
+    result = await _run_query(
+        query,
+        template="measurement_filtered" if where_clause else "measurement",
+        priority=AGGREGATE_QUERY_PRIORITY,
+        params=params,
+    )
     
     return f"""📈 **Measurement Statistics**
 
@@ -560,7 +1060,7 @@ def get_measurement_statistics(
 
 
 @mcp.tool()
-def get_drug_exposure_summary(limit: int = 50) -> str:
+async def get_drug_exposure_summary(limit: int = 50) -> str:
     """💊 Get summary of drug exposures in AmsterdamUMCdb.
 
     **What this does:** Returns aggregated statistics on medication usage
@@ -577,23 +1077,15 @@ def get_drug_exposure_summary(limit: int = 50) -> str:
     if not _validate_limit(limit):
         return f"Error: Invalid limit. Must be between 1 and {MAX_QUERY_ROWS}."
     
-    config = get_bigquery_config()
-    table_path = f"`{config['project']}.{config['dataset']}.drug_exposure`"
-    
-    query = f"""
-    SELECT 
-        drug_concept_id,
-        COUNT(*) as n_exposures,
-        COUNT(DISTINCT person_id) as n_patients,
-        AVG(TIMESTAMP_DIFF(drug_exposure_end_datetime, drug_exposure_start_datetime, HOUR)) as avg_duration_hours
-    FROM {table_path}
-    GROUP BY drug_concept_id
-    HAVING COUNT(DISTINCT person_id) >= 5
-    ORDER BY n_exposures DESC
-    LIMIT {limit}
-    """
-    
-    result = _execute_bigquery_query(query)
+    query = _render_template(
+        _DRUG_EXPOSURE_SQL, drug_exposure=get_bigquery_table_path("drug_exposure", _get_config())
+    )
+    result = await _run_query(
+        query,
+        template="drug_exposure",
+        params=[("lim", "INT64", limit)],
+        priority=AGGREGATE_QUERY_PRIORITY,
+    )
     
     return f"""💊 **Drug Exposure Summary**
 
@@ -606,7 +1098,7 @@ def get_drug_exposure_summary(limit: int = 50) -> str:
 
 
 @mcp.tool()
-def get_condition_prevalence(limit: int = 50) -> str:
+async def get_condition_prevalence(limit: int = 50) -> str:
     """🏥 Get prevalence of diagnoses/conditions in AmsterdamUMCdb.
 
     **What this does:** Returns aggregated counts of diagnoses and
@@ -623,22 +1115,16 @@ def get_condition_prevalence(limit: int = 50) -> str:
     if not _validate_limit(limit):
         return f"Error: Invalid limit. Must be between 1 and {MAX_QUERY_ROWS}."
     
-    config = get_bigquery_config()
-    table_path = f"`{config['project']}.{config['dataset']}.condition_occurrence`"
-    
-    query = f"""
-    SELECT 
-        condition_concept_id,
-        COUNT(*) as n_occurrences,
-        COUNT(DISTINCT person_id) as n_patients
-    FROM {table_path}
-    GROUP BY condition_concept_id
-    HAVING COUNT(DISTINCT person_id) >= 5
-    ORDER BY n_patients DESC
-    LIMIT {limit}
-    """
-    
-    result = _execute_bigquery_query(query)
+    query = _render_template(
+        _CONDITION_PREVALENCE_SQL,
+        condition_occurrence=get_bigquery_table_path("condition_occurrence", _get_config()),
+    )
+    result = await _run_query(
+        query,
+        template="condition_prevalence",
+        params=[("lim", "INT64", limit)],
+        priority=AGGREGATE_QUERY_PRIORITY,
+    )
     
     return f"""🏥 **Condition Prevalence**
 
@@ -651,7 +1137,7 @@ def get_condition_prevalence(limit: int = 50) -> str:
 
 
 @mcp.tool()
-def get_mortality_statistics() -> str:
+async def get_mortality_statistics() -> str:
     """📊 Get aggregated mortality statistics from AmsterdamUMCdb.
 
     **What this does:** Returns aggregated mortality statistics
@@ -662,35 +1148,13 @@ def get_mortality_statistics() -> str:
     Returns:
         Aggregated mortality statistics
     """
-    config = get_bigquery_config()
-    death_table = f"`{config['project']}.{config['dataset']}.death`"
-    person_table = f"`{config['project']}.{config['dataset']}.person`"
-    
-    query = f"""
-    WITH mortality AS (
-        SELECT 
-            p.person_id,
-            p.gender_concept_id,
-            CASE 
-                WHEN d.person_id IS NOT NULL THEN 1 
-                ELSE 0 
-            END as died
-        FROM {person_table} p
-        LEFT JOIN {death_table} d ON p.person_id = d.person_id
+    config = _get_config()
+    query = _render_template(
+        _MORTALITY_SQL,
+        person=get_bigquery_table_path("person", config),
+        death=get_bigquery_table_path("death", config),
     )
-    SELECT 
-        gender_concept_id,
-        COUNT(*) as total_patients,
-        SUM(died) as deaths,
-        ROUND(100.0 * SUM(died) / COUNT(*), 2) as mortality_rate_pct
-    FROM mortality
-    GROUP BY gender_concept_id
-    HAVING COUNT(*) >= 10
-    ORDER BY total_patients DESC
-    LIMIT 100
-    """
-    
-    result = _execute_bigquery_query(query)
+    result = await _run_query(query, template="mortality", priority=AGGREGATE_QUERY_PRIORITY)
     
     return f"""📊 **Mortality Statistics**
 
@@ -727,7 +1191,7 @@ def get_security_info() -> str:
 {datathon_status}
 
 ⏱️ **Rate Limiting:**
-- Queries in last hour: {rate_info['queries_in_last_hour']} / {rate_info['max_per_hour']}
+- Queries available now: {rate_info['tokens_available']} / {rate_info['max_per_hour']} per hour
 - Max per minute: {rate_info['max_per_minute']}
 
 📝 **Session Statistics:**
@@ -755,8 +1219,34 @@ def get_security_info() -> str:
 # These tools require concept tables which may not be available
 # ==========================================
 
+def _source_text_match(column: str, search_term: str) -> tuple[str, str]:
+    """
+    Build the WHERE condition for a source-text search.
+    
+    A term anchored with a wildcard only at its start or end ("ECMO%",
+    "%pump") becomes STARTS_WITH / ENDS_WITH, which BigQuery can stop
+    checking after the first characters; "%term%" and plain terms match
+    anywhere via CONTAINS_SUBSTR. Any other % or _ is matched literally.
+    
+    Returns:
+        Tuple of (condition using @term, value to bind as @term)
+    """
+    core = search_term.strip("%")
+    if core and "%" not in core:
+        starts = search_term.startswith("%")
+        ends = search_term.endswith("%")
+        if ends and not starts:
+            return f"STARTS_WITH(LOWER(CAST(`{column}` AS STRING)), LOWER(@term))", core
+        if starts and not ends:
+            return f"ENDS_WITH(LOWER(CAST(`{column}` AS STRING)), LOWER(@term))", core
+        search_term = core
+    
+    # CONTAINS_SUBSTR matches case-insensitively without LOWER()-ing every row
+    return f"CONTAINS_SUBSTR(`{column}`, @term)", search_term
+
+
 @mcp.tool()
-def search_by_source_text(
+async def search_by_source_text(
     table: str,
     search_term: str,
     source_column: str | None = None,
@@ -778,6 +1268,7 @@ def search_by_source_text(
     Args:
         table: Table to search (use `get_database_schema()` to see what exists)
         search_term: Text to search for in a *_source_value column
+            ("ECMO%" / "%pump" match only at the start / end)
         source_column: Optional override of the source text column (e.g., "device_source_value")
         additional_filters: Optional SQL WHERE conditions
         limit: Maximum rows (default: 100, max: 500)
@@ -790,47 +1281,31 @@ def search_by_source_text(
     table = table.strip()
     if not table:
         return f"{banner}\n❌ Table name is required."
+    if not _IDENTIFIER_RE.match(table):
+        return f"{banner}\n❌ Invalid table name: {table!r}"
+    if source_column and not _IDENTIFIER_RE.match(source_column):
+        return f"{banner}\n❌ Invalid column name: {source_column!r}"
     
     if limit > 500:
         limit = 500
     
     try:
-        from google.cloud import bigquery
-
-        config = get_bigquery_config()
+        config = _get_config()
         dataset_project = config.get("dataset_project", config["project"])
         dataset = config["dataset"]
-        location = config.get("location", "EU")
 
         # Resolve full table path in BigQuery (project/dataset/table)
-        full_table_path = get_bigquery_table_path(table.lower())
+        full_table_path = get_bigquery_table_path(table.lower(), config)
 
         # If caller didn't specify the source column, auto-detect the best *_source_value column
         if not source_column:
-            cols_query = f"""
-            SELECT column_name
-            FROM `{dataset_project}`.`{dataset}`.INFORMATION_SCHEMA.COLUMNS
-            WHERE table_name = '{table.lower()}'
-              AND LOWER(column_name) LIKE '%_source_value'
-            ORDER BY column_name
-            LIMIT 50
-            """
-
-            job_config = bigquery.QueryJobConfig()
-            cols_result = _bq_client.query(cols_query, job_config=job_config, location=location).result()
-            source_cols = [row.column_name for row in cols_result]
+            # Column names come from the cached table metadata (no INFORMATION_SCHEMA query)
+            columns = await _run_blocking(_table_columns, dataset_project, dataset, table.lower())
+            all_cols = [name for name, _, _ in columns]
+            source_cols = sorted(c for c in all_cols if c.lower().endswith("_source_value"))[:50]
 
             if not source_cols:
                 # Helpful fallback: show columns so user/LLM can choose explicitly
-                all_cols_query = f"""
-                SELECT column_name
-                FROM `{dataset_project}`.`{dataset}`.INFORMATION_SCHEMA.COLUMNS
-                WHERE table_name = '{table.lower()}'
-                ORDER BY ordinal_position
-                LIMIT 100
-                """
-                all_cols_result = _bq_client.query(all_cols_query, job_config=job_config, location=location).result()
-                all_cols = [row.column_name for row in all_cols_result]
                 return f"""{banner}
 ❌ No `*_source_value` column found for table **{table.lower()}**.
 
@@ -853,31 +1328,44 @@ Columns (first {min(100, len(all_cols))}):
             # Pick the first preferred that exists, else first *_source_value column
             source_column = next((c for c in preferred if c in source_cols), source_cols[0])
 
-        # Escape search term for SQL LIKE
-        safe_term = search_term.replace("'", "''").replace("%", "\\%").replace("_", "\\_")
-        
-        # Build WHERE clause
-        where_clause = f"LOWER(CAST(`{source_column}` AS STRING)) LIKE LOWER('%{safe_term}%')"
+        # The term is bound as a parameter instead of escaped into the SQL
+        where_clause, term = _source_text_match(source_column, search_term)
+        query_params = [
+            bigquery.ScalarQueryParameter("term", "STRING", term),
+            bigquery.ScalarQueryParameter("lim", "INT64", limit),
+        ]
         
         if additional_filters:
-            # Basic validation
-            dangerous = ["DROP", "DELETE", "INSERT", "UPDATE", "TRUNCATE", "--", ";"]
-            if any(d.lower() in additional_filters.lower() for d in dangerous):
+            # Basic validation (the full query is checked by enforce_security too)
+            if _DANGEROUS_FILTER_RE.search(additional_filters):
                 return f"{banner}\n❌ Invalid filter: potentially dangerous SQL detected"
             where_clause += f" AND ({additional_filters})"
         
-        # Aggregated query to respect privacy
+        # Aggregated query to respect privacy. Totals over the matching groups
+        # ride along on each row, so only the 20 displayed rows are returned.
         query = f"""
-        SELECT 
-            `{source_column}` AS source_value,
-            COUNT(DISTINCT person_id) as patient_count,
-            COUNT(*) as event_count
-        FROM {full_table_path}
-        WHERE {where_clause}
-        GROUP BY source_value
-        HAVING COUNT(DISTINCT person_id) >= 5
+        WITH agg AS (
+            SELECT 
+                `{source_column}` AS source_value,
+                COUNT(DISTINCT person_id) as patient_count,
+                COUNT(*) as event_count
+            FROM {full_table_path}
+            WHERE {where_clause}
+            GROUP BY source_value
+            HAVING COUNT(DISTINCT person_id) >= 5
+            ORDER BY patient_count DESC
+            LIMIT @lim
+        )
+        SELECT
+            source_value,
+            patient_count,
+            event_count,
+            COUNT(*) OVER () AS distinct_values,
+            SUM(patient_count) OVER () AS total_patients,
+            SUM(event_count) OVER () AS total_events
+        FROM agg
         ORDER BY patient_count DESC
-        LIMIT {limit}
+        LIMIT 20
         """
         
         # Security check
@@ -885,11 +1373,17 @@ Columns (first {min(100, len(all_cols))}):
         if not is_safe:
             return f"{banner}\n❌ **Security Error:** {msg}"
         
-        job_config = bigquery.QueryJobConfig()
-        result = _bq_client.query(query, job_config=job_config, location=location).result()
-        df = result.to_dataframe()
+        # At most 20 rows come back; read them directly rather than through pandas
+        rows = await _run_blocking(
+            _query_rows,
+            query,
+            bigquery.QueryJobConfig(
+                query_parameters=query_params,
+                job_timeout_ms=SEARCH_JOB_TIMEOUT_MS,
+            ),
+        )
         
-        if df.empty:
+        if not rows:
             return f"""{banner}
 🔍 **Search: "{search_term}"** in `{table.lower()}`
 Using:
@@ -904,36 +1398,45 @@ Next (do NOT re-run `get_database_schema()`):
 - Or specify a different text column via `source_column=...` after `get_table_info(...)`"""
         
         # Format results
-        total_patients = df['patient_count'].sum()
-        total_events = df['event_count'].sum()
+        distinct_values = rows[0]["distinct_values"]
+        total_patients = rows[0]["total_patients"]
+        total_events = rows[0]["total_events"]
         
-        result_text = []
-        for _, row in df.head(20).iterrows():
-            sv = row.get("source_value", "")
-            sv = "" if sv is None else str(sv)
-            result_text.append(
-                f"| {sv[:50]} | {row['patient_count']} | {row['event_count']} |"
-            )
+        result_text = "\n".join(
+            f"| {'' if sv is None else str(sv)[:50]} | {patient_count} | {event_count} |"
+            for sv, patient_count, event_count, *_ in rows
+        )
         
         return f"""{banner}
 🔍 **Search: "{search_term}"** in {table}
 
-Found {len(df)} distinct values (showing top 20):
+Found {distinct_values} distinct values (showing top {len(rows)}):
 
 | Source Value | Patients | Events |
 |-------------|----------|--------|
-{chr(10).join(result_text)}
+{result_text}
 
 **Summary:**
 - Total distinct patients: {total_patients}
 - Total events: {total_events}
-- Groups with ≥5 patients: {len(df)}
+- Groups with ≥5 patients: {distinct_values}
 
 💡 Use these source values to refine your queries."""
         
     except Exception as e:
         logger.error(f"Source text search failed: {e}")
-        return f"{banner}\n❌ Search failed: {str(e)}"
+        error = str(e)
+        if "timeout" in error.lower() or "timed out" in error.lower():
+            return f"""{banner}
+❌ Search failed: {error}
+
+⏱️ The search was stopped after {SEARCH_JOB_TIMEOUT_MS // 1000}s because it scans the whole column.
+Try:
+- A longer, more specific search term
+- Anchoring the term, e.g. "ECMO%" for values that start with ECMO
+- Naming the column with `source_column=...`
+- Narrowing rows with `additional_filters` (e.g., a date range)"""
+        return f"{banner}\n❌ Search failed: {error}"
 
 
 @mcp.tool()
@@ -1022,16 +1525,13 @@ No matching concepts found in AmsterdamUMCdb dictionary. Try:
 - Remove domain filter
 - Check available domains: Gender, Visit, Procedure, Condition, Drug, Measurement"""
         
-        results_text = []
-        for r in results:
-            cid = r['concept_id'] if r['concept_id'] else 'UNMAPPED'
-            name = r['concept_name'][:40] if r['concept_name'] else 'N/A'
-            domain = r['domain_id'][:15] if r['domain_id'] else 'Unknown'
-            source = r['source_code_description'][:40] if r['source_code_description'] else ''
-            
-            results_text.append(
-                f"| {cid} | {name} | {domain} | {source} |"
-            )
+        # One pass straight into the table body (and without reusing the
+        # `domain` argument name, which the header below still needs)
+        results_text = "\n".join(
+            f"| {r['concept_id'] or 'UNMAPPED'} | {(r['concept_name'] or 'N/A')[:40]} | "
+            f"{(r['domain_id'] or 'Unknown')[:15]} | {(r['source_code_description'] or '')[:40]} |"
+            for r in results
+        )
         
         return f"""{banner}
 🔎 **Search: "{search_term}"** {f'(domain: {domain})' if domain else ''}
@@ -1040,7 +1540,7 @@ Found {len(results)} concepts:
 
 | ID | Name | Domain | Source Description |
 |----|------|--------|-------------------|
-{chr(10).join(results_text)}
+{results_text}
 
 💡 Mapped concepts have numeric IDs - use these in queries.
 💡 UNMAPPED concepts exist in source data but have no standard ID."""
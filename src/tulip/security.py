@@ -19,10 +19,12 @@ This module implements multiple layers of protection:
 - Privacy-preserving audit logging
 """
 
+import functools
 import hashlib
 import re
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime, timezone
 from typing import Any
 
@@ -66,11 +68,45 @@ class EULAViolation(SecurityViolation):
 # Rate Limiting
 # -------------------------------------------------------------------
 
+class TokenBucket:
+    """
+    Token bucket holding up to `capacity` tokens, refilled at `rate` tokens/second.
+    
+    State is two floats, so checks are O(1) regardless of query history.
+    """
+    
+    __slots__ = ("capacity", "last", "rate", "tokens")
+    
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.last = time.monotonic()
+    
+    def available(self) -> float:
+        """Refill for the time elapsed since the last call and return the tokens left."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        return self.tokens
+    
+    def consume(self):
+        """Take one token (may go negative; refill pays it back)."""
+        self.available()
+        self.tokens -= 1
+    
+    def refund(self):
+        """Give back one token taken by consume()."""
+        self.tokens = min(self.capacity, self.available() + 1)
+
+
 class RateLimiter:
     """
     Token bucket rate limiter for query throttling.
     
     Prevents excessive querying which could indicate data extraction attempts.
+    One bucket enforces the hourly limit and one the per-minute limit.
+    Thread-safe: tools may run queries from worker threads concurrently.
     """
     
     def __init__(
@@ -80,7 +116,9 @@ class RateLimiter:
     ):
         self.max_per_hour = max_queries_per_hour
         self.max_per_minute = max_queries_per_minute
-        self._query_times: list[float] = []
+        self._hour_bucket = TokenBucket(max_queries_per_hour, max_queries_per_hour / 3600)
+        self._minute_bucket = TokenBucket(max_queries_per_minute, max_queries_per_minute / 60)
+        self._lock = threading.Lock()
     
     def check_rate_limit(self) -> tuple[bool, str]:
         """
@@ -89,27 +127,54 @@ class RateLimiter:
         Returns:
             Tuple of (allowed, message)
         """
-        now = time.time()
+        with self._lock:
+            # Check hourly limit
+            if self._hour_bucket.available() < 1:
+                return False, f"Rate limit exceeded: {self.max_per_hour} queries/hour. Please wait."
+            
+            # Check per-minute limit
+            if self._minute_bucket.available() < 1:
+                return False, f"Rate limit exceeded: {self.max_per_minute} queries/minute. Please slow down."
         
-        # Clean old entries
-        hour_ago = now - 3600
-        minute_ago = now - 60
-        self._query_times = [t for t in self._query_times if t > hour_ago]
+        return True, "OK"
+    
+    def record_query(self):
+        """Record a query execution."""
+        with self._lock:
+            self._hour_bucket.consume()
+            self._minute_bucket.consume()
+    
+    def try_acquire(self) -> tuple[bool, str]:
+        """
+        Check the limits and, if allowed, record the query in one step.
         
-        # Check hourly limit
-        if len(self._query_times) >= self.max_per_hour:
-            return False, f"Rate limit exceeded: {self.max_per_hour} queries/hour. Please wait."
+        Checking and recording under a single lock means concurrent calls
+        cannot all pass the check against the same remaining token.
         
-        # Check per-minute limit
-        recent = sum(1 for t in self._query_times if t > minute_ago)
-        if recent >= self.max_per_minute:
-            return False, f"Rate limit exceeded: {self.max_per_minute} queries/minute. Please slow down."
+        Returns:
+            Tuple of (allowed, message)
+        """
+        with self._lock:
+            if self._hour_bucket.available() < 1:
+                return False, f"Rate limit exceeded: {self.max_per_hour} queries/hour. Please wait."
+            if self._minute_bucket.available() < 1:
+                return False, f"Rate limit exceeded: {self.max_per_minute} queries/minute. Please slow down."
+            
+            self._hour_bucket.consume()
+            self._minute_bucket.consume()
         
         return True, "OK"
     
-    def record_query(self):
-        """Record a query execution."""
-        self._query_times.append(time.time())
+    def refund(self):
+        """Return a query acquired with try_acquire() that was not run."""
+        with self._lock:
+            self._hour_bucket.refund()
+            self._minute_bucket.refund()
+    
+    def tokens_available(self) -> int:
+        """Queries that can run right now under the hourly limit."""
+        with self._lock:
+            return max(0, int(self._hour_bucket.available()))
 
 
 # Global rate limiter instance
@@ -143,8 +208,13 @@ class QueryAuditLog:
     """
     
     def __init__(self, log_file_path: str | None = None):
-        self.entries: list[dict] = []
+        # Keep only the last 1000 entries in memory
+        self.entries: deque[dict] = deque(maxlen=1000)
         self.log_file_path = log_file_path
+        # Running totals for the whole session, so summaries don't rescan entries
+        self.total_queries = 0
+        self.successful = 0
+        self.tables_queried: set[str] = set()
     
     def log_query(
         self,
@@ -154,6 +224,7 @@ class QueryAuditLog:
         success: bool,
         error_message: str | None = None,
         execution_time_ms: float | None = None,
+        cache_hit: bool = False,
     ):
         """
         Log query metadata (NOT the query itself or results).
@@ -165,6 +236,7 @@ class QueryAuditLog:
             success: Whether query executed successfully
             error_message: Error message if failed (sanitized)
             execution_time_ms: Query execution time
+            cache_hit: Whether the result was served from the in-process cache
         """
         entry = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -174,13 +246,13 @@ class QueryAuditLog:
             "success": success,
             "error_type": self._sanitize_error(error_message) if error_message else None,
             "execution_time_ms": execution_time_ms,
+            "cache_hit": cache_hit,
         }
         
         self.entries.append(entry)
-        
-        # Keep only last 1000 entries in memory
-        if len(self.entries) > 1000:
-            self.entries = self.entries[-1000:]
+        self.total_queries += 1
+        self.successful += bool(success)
+        self.tables_queried.update(tables_accessed)
         
         # Log to file if configured (for datathon organizers)
         if self.log_file_path:
@@ -204,16 +276,14 @@ class QueryAuditLog:
     
     def get_summary(self) -> dict:
         """Get summary statistics (for debugging, no sensitive data)."""
-        if not self.entries:
+        if not self.total_queries:
             return {"total_queries": 0}
         
         return {
-            "total_queries": len(self.entries),
-            "successful": sum(1 for e in self.entries if e["success"]),
-            "failed": sum(1 for e in self.entries if not e["success"]),
-            "tables_queried": list(set(
-                t for e in self.entries for t in e.get("tables_accessed", [])
-            )),
+            "total_queries": self.total_queries,
+            "successful": self.successful,
+            "failed": self.total_queries - self.successful,
+            "tables_queried": list(self.tables_queried),
         }
 
 
@@ -221,8 +291,26 @@ class QueryAuditLog:
 _audit_log = QueryAuditLog()
 
 
+@functools.lru_cache(maxsize=512)
+def normalize_sql(sql_query: str) -> str:
+    """
+    Normalize a query for use as a cache key.
+    
+    Strips comments and collapses whitespace outside string literals, so
+    cosmetic differences map to the same key while literal values (and
+    therefore results) stay distinct. Memoized: sqlparse formatting costs
+    milliseconds, and tool templates repeat the same text on every call.
+    """
+    return sqlparse.format(sql_query, strip_comments=True, strip_whitespace=True).strip()
+
+
+@functools.lru_cache(maxsize=1024)
 def get_query_hash(query: str) -> str:
-    """Generate privacy-preserving hash of query."""
+    """
+    Generate privacy-preserving hash of query.
+    
+    Cached, since tools re-run the same queries (cache hits are audited too).
+    """
     return hashlib.sha256(query.encode()).hexdigest()
 
 
@@ -233,6 +321,7 @@ def log_query_execution(
     success: bool,
     error: str | None = None,
     execution_time_ms: float | None = None,
+    cache_hit: bool = False,
 ):
     """Log query execution to audit trail."""
     _audit_log.log_query(
@@ -242,6 +331,7 @@ def log_query_execution(
         success=success,
         error_message=error,
         execution_time_ms=execution_time_ms,
+        cache_hit=cache_hit,
     )
 
 
@@ -270,6 +360,58 @@ def _extract_tables_from_query(parsed) -> list[str]:
     return [t for t in tables if t]
 
 
+@functools.lru_cache(maxsize=512)
+def _parse_query(sql_query: str) -> tuple[int, str, tuple[str, ...]]:
+    """
+    Parse a query once and keep only what validation needs.
+    
+    Tool calls repeat the same SQL text, and sqlparse tokenization is the
+    most expensive part of validation, so results are memoized.
+    
+    Returns:
+        Tuple of (statement_count, statement_type, tables_accessed), where the
+        type and tables describe the first statement
+    """
+    statements = sqlparse.parse(sql_query)
+    if not statements:
+        return 0, "", ()
+    
+    statement = statements[0]
+    return len(statements), statement.get_type(), tuple(_extract_tables_from_query(statement))
+
+
+# Write operations, matched as a space-delimited word or at the start of the query
+_WRITE_OPERATIONS = (
+    "INSERT", "UPDATE", "DELETE", "DROP", "CREATE", "ALTER",
+    "TRUNCATE", "REPLACE", "MERGE", "EXEC", "EXECUTE", "GRANT",
+    "REVOKE", "INTO OUTFILE", "INTO DUMPFILE",
+)
+_WRITE_OPERATION_RE = re.compile(
+    "^({ops})|(?<= )({ops})(?= |$)".format(ops="|".join(_WRITE_OPERATIONS))
+)
+
+_LIMIT_RE = re.compile(r"LIMIT\s+(\d+)")
+
+_SENSITIVE_COLUMN_RES = [
+    (pattern, re.compile(rf"\b{pattern}\b", re.IGNORECASE)) for pattern in SENSITIVE_COLUMN_PATTERNS
+]
+
+_INJECTION_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), description)
+    for pattern, description in (
+        (r";\s*--", "SQL comment injection"),
+        (r";\s*/\*", "SQL block comment injection"),
+        (r"union\s+(all\s+)?select", "UNION injection"),
+        (r"'\s*or\s+'?\d+'?\s*=\s*'?\d+'?", "OR injection"),
+        (r"'\s*and\s+'?\d+'?\s*=\s*'?\d+'?", "AND injection"),
+        (r"waitfor\s+delay", "Time-based injection"),
+        (r"benchmark\s*\(", "Benchmark injection"),
+        (r"sleep\s*\(", "Sleep injection"),
+        (r"load_file\s*\(", "File access injection"),
+    )
+]
+
+
 def validate_query_security(sql_query: str) -> tuple[bool, str, list[str]]:
     """
     Comprehensive security validation for SQL queries.
@@ -288,21 +430,19 @@ def validate_query_security(sql_query: str) -> tuple[bool, str, list[str]]:
         if not sql_query or not sql_query.strip():
             return False, "Empty query", []
         
-        # Parse SQL
-        parsed_statements = sqlparse.parse(sql_query.strip())
-        if not parsed_statements:
+        # Parse SQL (memoized per query text)
+        statement_count, statement_type, parsed_tables = _parse_query(sql_query.strip())
+        if not statement_count:
             return False, "Invalid SQL syntax", []
         
         # Block multiple statements (injection vector)
-        if len(parsed_statements) > 1:
+        if statement_count > 1:
             return False, "Multiple statements not allowed (potential SQL injection)", []
         
-        statement = parsed_statements[0]
-        statement_type = statement.get_type()
         sql_upper = sql_query.strip().upper()
         
         # Extract tables for audit
-        tables = _extract_tables_from_query(statement)
+        tables = list(parsed_tables)
         
         # ===============================
         # RULE 1: Only SELECT allowed
@@ -317,33 +457,16 @@ def validate_query_security(sql_query: str) -> tuple[bool, str, list[str]]:
         # ===============================
         # RULE 2: Block write operations
         # ===============================
-        write_operations = {
-            "INSERT", "UPDATE", "DELETE", "DROP", "CREATE", "ALTER",
-            "TRUNCATE", "REPLACE", "MERGE", "EXEC", "EXECUTE", "GRANT",
-            "REVOKE", "INTO OUTFILE", "INTO DUMPFILE",
-        }
-        
-        for op in write_operations:
-            if f" {op} " in f" {sql_upper} " or sql_upper.startswith(op):
-                return False, f"Write operation not allowed: {op}", tables
+        write_match = _WRITE_OPERATION_RE.search(sql_upper)
+        if write_match:
+            op = write_match.group(1) or write_match.group(2)
+            return False, f"Write operation not allowed: {op}", tables
         
         # ===============================
         # RULE 3: Block injection patterns
         # ===============================
-        injection_patterns = [
-            (r";\s*--", "SQL comment injection"),
-            (r";\s*/\*", "SQL block comment injection"),
-            (r"union\s+(all\s+)?select", "UNION injection"),
-            (r"'\s*or\s+'?\d+'?\s*=\s*'?\d+'?", "OR injection"),
-            (r"'\s*and\s+'?\d+'?\s*=\s*'?\d+'?", "AND injection"),
-            (r"waitfor\s+delay", "Time-based injection"),
-            (r"benchmark\s*\(", "Benchmark injection"),
-            (r"sleep\s*\(", "Sleep injection"),
-            (r"load_file\s*\(", "File access injection"),
-        ]
-        
-        for pattern, description in injection_patterns:
-            if re.search(pattern, sql_upper, re.IGNORECASE):
+        for pattern, description in _INJECTION_PATTERNS:
+            if pattern.search(sql_upper):
                 return False, f"Injection pattern detected: {description}", tables
         
         # ===============================
@@ -360,7 +483,7 @@ def validate_query_security(sql_query: str) -> tuple[bool, str, list[str]]:
             return False, f"Query must include LIMIT clause (max {MAX_QUERY_ROWS} rows)", tables
         
         # Check if limit is too high
-        limit_match = re.search(r"LIMIT\s+(\d+)", sql_upper)
+        limit_match = _LIMIT_RE.search(sql_upper)
         if limit_match:
             limit_value = int(limit_match.group(1))
             if limit_value > MAX_QUERY_ROWS:
@@ -369,9 +492,9 @@ def validate_query_security(sql_query: str) -> tuple[bool, str, list[str]]:
         # ===============================
         # RULE 6: Block sensitive column patterns
         # ===============================
-        for pattern in SENSITIVE_COLUMN_PATTERNS:
+        for pattern, pattern_re in _SENSITIVE_COLUMN_RES:
             # Check if accessing columns that shouldn't exist in de-identified data
-            if re.search(rf"\b{pattern}\b", sql_query, re.IGNORECASE):
+            if pattern_re.search(sql_query):
                 logger.warning(f"Query references potentially sensitive pattern: {pattern}")
                 # This is a warning, not a block, as the data is de-identified
         
@@ -382,6 +505,33 @@ def validate_query_security(sql_query: str) -> tuple[bool, str, list[str]]:
         return False, f"Security validation failed: {e}", []
 
 
+# Blocking re-identification checks, fused into one alternation so the SQL is
+# scanned once. Each named group maps back to its check through
+# match.lastgroup; order is priority order when several checks match. Only the
+# extreme-value patterns ignore case, as when these were separate re.search calls.
+_REIDENTIFICATION_CHECKS = {
+    "person_id_lookup": r"where\s+person_id\s*=\s*\d+",
+    "unique_record": r"having\s+count\s*\(\s*\*\s*\)\s*=\s*1",
+    "small_group": r"having\s+count\s*\(\s*\*\s*\)\s*<\s*(?P<group_size>\d+)",
+    "extreme_birth_order": r"(?i:order\s+by\s+year_of_birth\s+(asc|desc)?\s*limit\s+1)",
+    "extreme_age_order": r"(?i:order\s+by\s+age\s+(asc|desc)?\s*limit\s+1)",
+    "extreme_birth_year": r"(?i:(min|max)\s*\(\s*year_of_birth\s*\))",
+}
+_REIDENTIFICATION_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _REIDENTIFICATION_CHECKS.items())
+)
+_REIDENTIFICATION_MESSAGES = {
+    "person_id_lookup": "Direct person_id lookup not allowed. Use aggregated queries.",
+    "unique_record": "Queries finding unique records pose re-identification risk",
+    "small_group": f"Minimum group size is {MIN_GROUP_SIZE} for privacy protection",
+    "extreme_birth_order": "Query targets oldest/youngest person - potential re-identification risk",
+    "extreme_age_order": "Query targets oldest/youngest person - potential re-identification risk",
+    "extreme_birth_year": "Query targets extreme birth year - potential re-identification risk",
+}
+
+_CONCEPT_LOOKUP_RE = re.compile(r"where\s+.*concept_id\s*=")
+
+
 def _check_reidentification_risk(sql_query: str, sql_upper: str) -> tuple[bool, str]:
     """
     Check for re-identification risk patterns.
@@ -390,34 +540,20 @@ def _check_reidentification_risk(sql_query: str, sql_upper: str) -> tuple[bool,
     even in de-identified data.
     """
     
-    # Pattern 1: Selecting individual records by specific criteria
-    # This could be used to identify known individuals
-    if re.search(r"where\s+person_id\s*=\s*\d+", sql_upper):
-        return False, "Direct person_id lookup not allowed. Use aggregated queries."
-    
-    # Pattern 2: Unique record identification
-    # Finding records that appear only once
-    if re.search(r"having\s+count\s*\(\s*\*\s*\)\s*=\s*1", sql_upper):
-        return False, "Queries finding unique records pose re-identification risk"
-    
-    # Pattern 3: Very small group sizes
-    small_group_match = re.search(r"having\s+count\s*\(\s*\*\s*\)\s*<\s*(\d+)", sql_upper)
-    if small_group_match:
-        group_size = int(small_group_match.group(1))
-        if group_size < MIN_GROUP_SIZE:
-            return False, f"Minimum group size is {MIN_GROUP_SIZE} for privacy protection"
-    
-    # Pattern 4: Extreme value searches (oldest, youngest, etc.)
-    # These can identify outliers
-    extreme_patterns = [
-        (r"order\s+by\s+year_of_birth\s+(asc|desc)?\s*limit\s+1", "oldest/youngest person"),
-        (r"order\s+by\s+age\s+(asc|desc)?\s*limit\s+1", "oldest/youngest person"),
-        (r"(min|max)\s*\(\s*year_of_birth\s*\)", "extreme birth year"),
-    ]
-    
-    for pattern, description in extreme_patterns:
-        if re.search(pattern, sql_upper, re.IGNORECASE):
-            return False, f"Query targets {description} - potential re-identification risk"
+    # Patterns 1-4: direct person_id lookups, unique records, very small
+    # groups and extreme values (oldest, youngest, etc.), in one scan.
+    # Only the first match of each check counts, as with re.search.
+    first_matches = {}
+    for match in _REIDENTIFICATION_RE.finditer(sql_upper):
+        first_matches.setdefault(match.lastgroup, match)
+    
+    for check in _REIDENTIFICATION_CHECKS:
+        match = first_matches.get(check)
+        if match is None:
+            continue
+        if check == "small_group" and int(match.group("group_size")) >= MIN_GROUP_SIZE:
+            continue
+        return False, _REIDENTIFICATION_MESSAGES[check]
     
     # Pattern 5: Cross-referencing multiple quasi-identifiers
     # Combining multiple attributes to narrow down individuals
@@ -430,7 +566,7 @@ def _check_reidentification_risk(sql_query: str, sql_upper: str) -> tuple[bool,
     
     # Pattern 6: Rare condition/procedure lookup
     # Very rare conditions could identify individuals
-    if re.search(r"where\s+.*concept_id\s*=", sql_upper):
+    if _CONCEPT_LOOKUP_RE.search(sql_upper):
         # This is allowed but should use aggregation
         if "count(" not in sql_upper and "group by" not in sql_upper:
             logger.warning("Direct condition lookup without aggregation - consider using aggregated queries")
@@ -467,6 +603,26 @@ def check_eula_compliance() -> tuple[bool, str]:
     return True, "EULA compliance verified"
 
 
+def _check_access() -> tuple[bool, str]:
+    """
+    Rate limit and EULA checks shared by every query path.
+    
+    An allowed call is counted against the rate limit immediately.
+    """
+    # Check the rate limit and count this query atomically
+    rate_ok, rate_msg = _rate_limiter.try_acquire()
+    if not rate_ok:
+        return False, rate_msg
+    
+    # Check EULA compliance
+    eula_ok, eula_msg = check_eula_compliance()
+    if not eula_ok:
+        # Log but don't block during development
+        logger.warning(f"EULA compliance warning: {eula_msg}")
+    
+    return True, "OK"
+
+
 def enforce_security(sql_query: str) -> tuple[bool, str, list[str]]:
     """
     Main security enforcement function.
@@ -479,28 +635,41 @@ def enforce_security(sql_query: str) -> tuple[bool, str, list[str]]:
     Returns:
         Tuple of (allowed, message, tables_accessed)
     """
-    # Check rate limit
-    rate_ok, rate_msg = check_rate_limit()
-    if not rate_ok:
-        return False, rate_msg, []
-    
-    # Check EULA compliance
-    eula_ok, eula_msg = check_eula_compliance()
-    if not eula_ok:
-        # Log but don't block during development
-        logger.warning(f"EULA compliance warning: {eula_msg}")
+    # Check rate limit and EULA compliance
+    access_ok, access_msg = _check_access()
+    if not access_ok:
+        return False, access_msg, []
     
-    # Validate query security
+    # Validate query security; rejected queries do not count against the limit
     query_ok, query_msg, tables = validate_query_security(sql_query)
     if not query_ok:
+        _rate_limiter.refund()
         return False, query_msg, tables
     
-    # Record the query for rate limiting
-    record_query()
-    
     return True, "Security checks passed", tables
 
 
+def enforce_trusted_query(tables: list[str]) -> tuple[bool, str, list[str]]:
+    """
+    Security enforcement for server-built queries that already passed validation.
+    
+    Only for fixed SQL templates owned by the MCP server, never for user SQL.
+    Query validation is skipped, but rate limiting and EULA checks still
+    apply, so templated tools cannot be used to bypass throttling.
+    
+    Args:
+        tables: Tables the template accesses (from its validation)
+    
+    Returns:
+        Tuple of (allowed, message, tables_accessed)
+    """
+    access_ok, access_msg = _check_access()
+    if not access_ok:
+        return False, access_msg, []
+    
+    return True, "Security checks passed", list(tables)
+
+
 # -------------------------------------------------------------------
 # Secure Result Handling
 # -------------------------------------------------------------------
@@ -541,19 +710,52 @@ def check_result_privacy(result_df, query: str) -> tuple[bool, str]:
         if result_df is None or len(result_df) == 0:
             return True, ""
         
+        column_minimums = {
+            col: result_df[col].min() for col in result_df.columns if "count" in col.lower()
+        }
+        return check_result_summary_privacy(len(result_df), list(result_df.columns), column_minimums, query)
+    
+    except Exception as e:
+        logger.error(f"Result privacy check failed: {e}")
+        return True, ""  # Fail open but log
+
+
+def check_result_summary_privacy(
+    row_count: int,
+    columns: list[str],
+    column_minimums: dict,
+    query: str,
+) -> tuple[bool, str]:
+    """
+    Check a summary of query results for privacy concerns.
+    
+    Same checks as check_result_privacy, for callers that stream rows
+    instead of materializing a dataframe.
+    
+    Args:
+        row_count: Total number of result rows
+        columns: Result column names
+        column_minimums: Minimum value of each column whose name contains "count"
+        query: Original query (for context)
+    
+    Returns:
+        Tuple of (safe_to_return, warning_message)
+    """
+    try:
+        if row_count == 0:
+            return True, ""
+        
         # Check 1: Too few results in grouped query might reveal individuals
-        if len(result_df) == 1:
+        if row_count == 1:
             # Single row results are concerning unless it's an aggregate
             sql_upper = query.upper()
             if "GROUP BY" in sql_upper and "COUNT" not in sql_upper:
                 return False, "Query returned single record - potential privacy risk"
         
         # Check 2: Small group sizes in aggregated results
-        if "count" in [col.lower() for col in result_df.columns]:
-            count_cols = [col for col in result_df.columns if "count" in col.lower()]
-            for col in count_cols:
-                min_count = result_df[col].min()
-                if min_count < MIN_GROUP_SIZE:
+        if "count" in [col.lower() for col in columns]:
+            for col, min_count in column_minimums.items():
+                if min_count is not None and min_count < MIN_GROUP_SIZE:
                     return False, f"Results contain groups smaller than {MIN_GROUP_SIZE} - suppressed for privacy"
         
         return True, ""
@@ -571,7 +773,7 @@ def get_security_status() -> dict:
     """Get current security status for diagnostics."""
     return {
         "rate_limiter": {
-            "queries_in_last_hour": len(_rate_limiter._query_times),
+            "tokens_available": _rate_limiter.tokens_available(),
             "max_per_hour": _rate_limiter.max_per_hour,
             "max_per_minute": _rate_limiter.max_per_minute,
         },
@@ -0,0 +1,45 @@
+"""
+Tests for TULIP in-process caches.
+"""
+
+
+class TestTTLCache:
+    """Tests for the bounded TTL + LRU cache."""
+
+    def test_get_returns_stored_value(self):
+        """A stored value should be returned until it expires."""
+        from tulip.cache import TTLCache
+
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("q", "result")
+
+        assert cache.get("q") == "result"
+        assert cache.get("missing") is None
+
+    def test_entries_expire(self, monkeypatch):
+        """Entries older than the TTL should be dropped."""
+        from tulip import cache as cache_module
+
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+        cache = cache_module.TTLCache(maxsize=4, ttl=10)
+        cache.set("q", "result")
+        now[0] += 11
+
+        assert cache.get("q") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used entry should be evicted when full."""
+        from tulip.cache import TTLCache
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
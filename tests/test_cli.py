@@ -0,0 +1,45 @@
+"""
+Tests for the TULIP command-line interface.
+"""
+
+import sys
+
+import pytest
+
+
+class TestEntryPoint:
+    """Tests for the `tulip` entry point."""
+
+    @pytest.mark.parametrize("flag", ["--version", "-v"])
+    def test_version_fast_path_matches_cli(self, flag, monkeypatch, capsys):
+        """The fast path should print the same text as the Typer callback."""
+        from typer.testing import CliRunner
+
+        from tulip.__main__ import main
+        from tulip.cli import app
+        
+        monkeypatch.setattr(sys, "argv", ["tulip", flag])
+        main()
+        
+        assert capsys.readouterr().out == CliRunner().invoke(app, [flag]).output
+
+
+class TestConfigCommand:
+    """Tests for `tulip config`."""
+
+    def test_recompile_reports_malformed_config(self, tmp_path, monkeypatch):
+        """A malformed config.json should be reported, not crash with a traceback."""
+        from typer.testing import CliRunner
+
+        from tulip import config
+        from tulip.cli import app
+        
+        path = tmp_path / "config.json"
+        path.write_text("{not json")
+        monkeypatch.setattr(config, "_RUNTIME_CONFIG_PATH", path)
+        monkeypatch.setattr(config, "_RUNTIME_CONFIG_CACHE_PATH", tmp_path / "config.cache")
+        
+        result = CliRunner().invoke(app, ["config", "--recompile"])
+        
+        assert result.exit_code == 1
+        assert "Could not parse config file" in result.output
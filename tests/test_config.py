@@ -26,6 +26,19 @@ class TestDatathonPeriod:
         assert isinstance(status, str)
         assert len(status) > 0
 
+    def test_within_period_uses_bounds(self, monkeypatch):
+        """is_within_datathon_period should compare the clock against both bounds."""
+        from tulip import config
+        
+        for when, expected in (
+            (config.DATATHON_START.timestamp() - 1, False),
+            (config.DATATHON_START.timestamp(), True),
+            (config.DATATHON_END.timestamp(), True),
+            (config.DATATHON_END.timestamp() + 1, False),
+        ):
+            monkeypatch.setattr(config.time, "time", lambda: when)
+            assert config.is_within_datathon_period() is expected
+
 
 class TestBigQueryConfig:
     """Tests for BigQuery configuration."""
@@ -63,6 +76,15 @@ class TestBigQueryConfig:
             if old_dataset:
                 os.environ["TULIP_BQ_DATASET"] = old_dataset
 
+    def test_aggregate_priority_validated(self, caplog):
+        """Unknown job priorities should fall back to INTERACTIVE with a warning."""
+        from tulip.config import _parse_query_priority
+        
+        assert _parse_query_priority("batch") == "BATCH"
+        assert _parse_query_priority("INTERACTIVE") == "INTERACTIVE"
+        assert _parse_query_priority("LOW") == "INTERACTIVE"
+        assert "TULIP_BQ_AGGREGATE_PRIORITY" in caplog.text
+
 
 class TestTableConfiguration:
     """Tests for AmsterdamUMCdb table configuration."""
@@ -94,12 +116,12 @@ class TestTableConfiguration:
             assert "notes" in info, f"{table_name} missing notes"
 
     def test_get_available_tables(self):
-        """get_available_tables should return list of table names."""
+        """get_available_tables should return a tuple of table names."""
         from tulip.config import get_available_tables
         
         tables = get_available_tables()
         
-        assert isinstance(tables, list)
+        assert isinstance(tables, tuple)
         assert len(tables) == 7
         assert "person" in tables
         assert "measurement" in tables
@@ -117,12 +139,333 @@ class TestSecurityConfig:
 
     def test_get_security_config(self):
         """get_security_config should return security settings."""
+        from collections.abc import Mapping
+
         from tulip.config import get_security_config
         
         config = get_security_config()
         
-        assert isinstance(config, dict)
+        assert isinstance(config, Mapping)
         assert "max_query_rows" in config
         assert "min_group_size" in config
         assert "sensitive_column_patterns" in config
 
+
+class TestRuntimeConfig:
+    """Tests for runtime configuration loading and caching."""
+
+    @pytest.fixture
+    def config_path(self, tmp_path, monkeypatch):
+        """Point the runtime config at a temporary file."""
+        from tulip import config
+
+        path = tmp_path / "config.json"
+        monkeypatch.setattr(config, "_RUNTIME_CONFIG_PATH", path)
+        monkeypatch.setattr(config, "_RUNTIME_CONFIG_CACHE_PATH", tmp_path / "config.cache")
+        monkeypatch.setattr(config, "_runtime_config_cache", None)
+        return path
+
+    def test_missing_file_returns_defaults(self, config_path):
+        """A missing config file should yield the default configuration."""
+        from tulip.config import _get_default_runtime_config, load_runtime_config
+        
+        assert load_runtime_config() == _get_default_runtime_config()
+
+    def test_save_then_load_round_trip(self, config_path):
+        """Saved values should be returned by the next load."""
+        from tulip.config import load_runtime_config, save_runtime_config
+        
+        save_runtime_config({"bigquery_project": "demo", "_secret": "x"})
+        config = load_runtime_config()
+        
+        assert config["bigquery_project"] == "demo"
+        assert "_secret" not in config
+        assert config["bigquery_location"] == "EU"  # Default merged in
+
+    def test_save_leaves_no_temp_files(self, config_path):
+        """Saving should rename its temp file into place, not leave it behind."""
+        from tulip.config import save_runtime_config
+
+        save_runtime_config({"bigquery_project": "demo"})
+        save_runtime_config({"bigquery_project": "again"})
+
+        assert not list(config_path.parent.glob(".cfg-*"))
+        assert '"again"' in config_path.read_text()
+
+    def test_failed_save_removes_temp_file(self, config_path, monkeypatch):
+        """A save that fails partway should clean up its temp file and keep the old config."""
+        from tulip import config
+
+        config.save_runtime_config({"bigquery_project": "demo"})
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(config.os, "replace", fail)
+        with pytest.raises(OSError):
+            config.save_runtime_config({"bigquery_project": "lost"})
+
+        assert not list(config_path.parent.glob(".cfg-*"))
+        assert '"demo"' in config_path.read_text()
+
+    def test_cached_config_is_not_shared(self, config_path):
+        """Mutating a loaded config must not leak into later loads."""
+        from tulip.config import load_runtime_config, save_runtime_config
+        
+        save_runtime_config({"bigquery_project": "demo"})
+        load_runtime_config()["bigquery_project"] = "mutated"
+        
+        assert load_runtime_config()["bigquery_project"] == "demo"
+
+    def test_reloads_when_file_changes(self, config_path):
+        """Edits to the file on disk should invalidate the cache."""
+        import os
+
+        from tulip.config import load_runtime_config
+        
+        config_path.write_text('{"bigquery_project": "first"}')
+        assert load_runtime_config()["bigquery_project"] == "first"
+        
+        config_path.write_text('{"bigquery_project": "second"}')
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        assert load_runtime_config()["bigquery_project"] == "second"
+
+    def test_compiled_cache_used_when_source_unchanged(self, config_path, monkeypatch):
+        """A compiled cache matching the JSON source should skip json parsing."""
+        from tulip import config
+        
+        config.save_runtime_config({"bigquery_project": "demo"})
+        config._runtime_config_cache = None
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("config.json should not be re-parsed")
+        
+        monkeypatch.setattr(config.json, "loads", fail)
+        assert config.load_runtime_config()["bigquery_project"] == "demo"
+
+    def test_compiled_cache_ignored_when_source_edited(self, config_path, monkeypatch):
+        """Hand edits to config.json must win over a stale compiled cache."""
+        from tulip import config
+        
+        config.save_runtime_config({"bigquery_project": "old"})
+        config_path.write_text('{"bigquery_project": "edited"}')
+        config._runtime_config_cache = None
+        
+        assert config.load_runtime_config()["bigquery_project"] == "edited"
+
+    def test_broken_file_parsed_once(self, config_path, caplog):
+        """An unparseable config.json should be read and warned about once per change."""
+        from tulip.config import _get_default_runtime_config, load_runtime_config
+        
+        config_path.write_text("{not json")
+        
+        assert load_runtime_config() == _get_default_runtime_config()
+        assert load_runtime_config() == _get_default_runtime_config()
+        assert caplog.text.count("Could not parse runtime config") == 1
+
+
+class TestBigQueryConfigValidation:
+    """Tests for combined BigQuery config resolution and validation."""
+
+    def test_with_validation_matches_separate_calls(self, monkeypatch):
+        """The combined helper should agree with the individual functions."""
+        from tulip.config import (
+            get_bigquery_config,
+            get_bigquery_config_with_validation,
+            validate_bigquery_config,
+        )
+        
+        monkeypatch.setenv("TULIP_BQ_PROJECT", "billing-project")
+        monkeypatch.setenv("TULIP_BQ_DATASET", "umcdb")
+        
+        config, is_valid, message = get_bigquery_config_with_validation()
+        
+        assert config == get_bigquery_config()
+        assert (is_valid, message) == validate_bigquery_config()
+        assert is_valid
+
+    def test_env_change_invalidates_cached_config(self, monkeypatch):
+        """Changing a TULIP_BQ_* variable should be picked up immediately."""
+        from tulip.config import get_bigquery_config
+        
+        monkeypatch.setenv("TULIP_BQ_PROJECT", "first")
+        assert get_bigquery_config()["project"] == "first"
+        
+        monkeypatch.setenv("TULIP_BQ_PROJECT", "second")
+        monkeypatch.setenv("TULIP_BQ_LOCATION", "US")
+        config = get_bigquery_config()
+        
+        assert config["project"] == "second"
+        assert config["location"] == "US"
+
+    def test_full_env_skips_config_file(self, monkeypatch):
+        """With every TULIP_BQ_* variable set the config file is not consulted."""
+        from tulip import config
+        
+        for name, value in zip(config._BIGQUERY_ENV_VARS, ("p", "dp", "d", "US")):
+            monkeypatch.setenv(name, value)
+        
+        def fail():
+            raise AssertionError("runtime config should not be loaded")
+        
+        monkeypatch.setattr(config, "_load_runtime_config_shared", fail)
+        
+        assert config.get_bigquery_config() == {
+            "project": "p", "dataset_project": "dp", "dataset": "d", "location": "US",
+        }
+
+
+class TestDictionaryLookup:
+    """Tests for concept lookups against the AmsterdamUMCdb dictionary."""
+
+    @pytest.fixture
+    def dictionary(self, monkeypatch):
+        """Install a small in-memory dictionary instead of downloading it."""
+        import pandas as pd
+
+        from tulip import config
+
+        df = pd.DataFrame({
+            "concept_id": [8507.0, 8532.0, 8507.0, None],
+            "concept_name": ["MALE", "FEMALE", "Male duplicate", "Unmapped"],
+            "domain_id": ["Gender", "Gender", "Gender", "Observation"],
+            "vocabulary_id": ["Gender", None, "Gender", None],
+            "source_code_description": ["Man", "Vrouw", "M", "Ongemapt"],
+        })
+        monkeypatch.setattr(config, "_dictionary_cache", config._prepare_dictionary(df))
+        monkeypatch.setattr(config, "_concept_index", None)
+        monkeypatch.setattr(config, "_trigram_index", None)
+        return df
+
+    def test_lookup_returns_first_mapping(self, dictionary):
+        """Duplicate concept_ids should resolve to the first row."""
+        from tulip.config import lookup_concept_in_dictionary
+
+        concept = lookup_concept_in_dictionary(8507)
+
+        assert concept["concept_name"] == "MALE"
+        assert concept["concept_id"] == 8507
+
+    def test_lookup_normalizes_missing_values(self, dictionary):
+        """Missing optional fields should come back as None."""
+        from tulip.config import lookup_concept_in_dictionary
+
+        assert lookup_concept_in_dictionary(8532)["vocabulary_id"] is None
+
+    def test_lookup_unknown_concept(self, dictionary):
+        """Unknown concept_ids should return None."""
+        from tulip.config import lookup_concept_in_dictionary
+
+        assert lookup_concept_in_dictionary(123) is None
+
+    def test_lookup_result_is_a_copy(self, dictionary):
+        """Mutating a lookup result must not change the index."""
+        from tulip.config import lookup_concept_in_dictionary
+
+        lookup_concept_in_dictionary(8507)["concept_name"] = "changed"
+
+        assert lookup_concept_in_dictionary(8507)["concept_name"] == "MALE"
+
+    def test_search_is_case_insensitive(self, dictionary):
+        """Search should match concept names and descriptions in any case."""
+        from tulip.config import search_concepts_in_dictionary
+
+        names = [c["concept_name"] for c in search_concepts_in_dictionary("vrouw")]
+
+        assert names == ["FEMALE"]
+
+    def test_search_treats_term_as_plain_text(self, dictionary):
+        """Regex metacharacters in the search term should not raise."""
+        from tulip.config import search_concepts_in_dictionary
+
+        assert search_concepts_in_dictionary("male (") == []
+
+    def test_search_domain_filter(self, dictionary):
+        """The domain filter should restrict results to matching domains."""
+        from tulip.config import search_concepts_in_dictionary
+
+        results = search_concepts_in_dictionary("m", domain="observation")
+
+        assert [c["concept_name"] for c in results] == ["Unmapped"]
+        assert results[0]["is_mapped"] is False
+
+    def test_indexed_search_matches_full_scan(self, dictionary):
+        """Trigram-narrowed searches should return what a full scan would."""
+        from tulip.config import search_concepts_in_dictionary
+
+        for term in ("male", "MAN", "ale dup", "gemapt", "zzz", "ma"):
+            expected = [
+                name for name, desc in zip(dictionary["concept_name"], dictionary["source_code_description"])
+                if term.lower() in name.lower() or term.lower() in desc.lower()
+            ]
+            found = [c["concept_name"] for c in search_concepts_in_dictionary(term)]
+            assert found == expected, term
+
+
+class TestDictionaryDownloadCache:
+    """Tests for the ETag-validated local dictionary copy."""
+
+    CSV = (
+        b"concept_id,concept_name,domain_id,vocabulary_id,source_code_description\n"
+        b"8507,MALE,Gender,Gender,Man\n"
+        b"8532,FEMALE,Gender,,Vrouw\n"
+    )
+
+    @pytest.fixture
+    def fake_get(self, tmp_path, monkeypatch):
+        """Serve the dictionary from a fake GitHub that honours If-None-Match."""
+        import io
+        import types
+
+        from tulip import config
+
+        monkeypatch.setattr(config, "_DICTIONARY_PARQUET_PATH", tmp_path / "dictionary.parquet")
+        monkeypatch.setattr(config, "_DICTIONARY_ETAG_PATH", tmp_path / "dictionary.etag")
+        monkeypatch.setattr(config, "_dictionary_cache", None)
+        monkeypatch.setattr(config, "_concept_index", None)
+        monkeypatch.setattr(config, "_trigram_index", None)
+
+        calls = []
+
+        class FakeResponse:
+            def __init__(self, status_code):
+                self.status_code = status_code
+                self.headers = {"ETag": '"v1"'}
+                self.raw = io.BytesIO(TestDictionaryDownloadCache.CSV)
+
+            def raise_for_status(self):
+                pass
+
+        def get(url, headers=None, **kwargs):
+            calls.append(headers or {})
+            status = 304 if (headers or {}).get("If-None-Match") == '"v1"' else 200
+            return FakeResponse(status)
+
+        monkeypatch.setattr(config, "_get_http_session", lambda: types.SimpleNamespace(get=get))
+        return calls
+
+    def test_second_start_uses_local_copy(self, fake_get):
+        """A 304 response should load the saved parquet copy."""
+        from tulip import config
+
+        first = config.get_amsterdamumcdb_dictionary()
+        config._dictionary_cache = None
+        second = config.get_amsterdamumcdb_dictionary()
+
+        assert fake_get == [{}, {"If-None-Match": '"v1"'}]
+        assert list(second["concept_name"]) == list(first["concept_name"])
+        assert config.lookup_concept_in_dictionary(8532)["vocabulary_id"] is None
+
+    def test_corrupt_local_copy_downloaded_again(self, fake_get):
+        """An unreadable local copy after a 304 should trigger a full download."""
+        from tulip import config
+
+        config.get_amsterdamumcdb_dictionary()
+        config._DICTIONARY_PARQUET_PATH.write_bytes(b"not parquet")
+        config._dictionary_cache = None
+        df = config.get_amsterdamumcdb_dictionary()
+
+        assert fake_get == [{}, {"If-None-Match": '"v1"'}, {}]
+        assert list(df["concept_name"]) == ["MALE", "FEMALE"]
@@ -0,0 +1,666 @@
+"""
+Tests for TULIP MCP server query execution.
+
+BigQuery is replaced by a fake client; no network access is needed.
+"""
+
+import pytest
+
+
+def _fake_rows(columns, rows):
+    """Build a stand-in for a BigQuery RowIterator over the given rows."""
+    from google.cloud.bigquery import Row, SchemaField
+
+    field_to_index = {name: i for i, name in enumerate(columns)}
+
+    class FakeRowIterator(list):
+        schema = tuple(SchemaField(name, "STRING") for name in columns)
+
+        @property
+        def total_rows(self):
+            return len(self)
+
+        def to_arrow(self, **kwargs):
+            import pyarrow as pa
+
+            return pa.table({name: [row[i] for row in self] for i, name in enumerate(columns)})
+
+    return FakeRowIterator(Row(row, field_to_index) for row in rows)
+
+
+class _FakeBigQuery:
+    """
+    Stand-in for the BigQuery client.
+
+    Records each submitted (sql, job_config) in `queries` and answers with
+    the rows set through returns(), or raises `error`. `on_query` runs
+    before answering, e.g. to hold a query open.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.columns, self.rows = ["n"], [(1,)]
+        self.error = None
+        self.on_query = None
+        self.schema = []
+        self.tables_requested = []
+
+    def returns(self, columns, rows):
+        self.columns, self.rows = columns, rows
+
+    def query_and_wait(self, sql, job_config=None, location=None):
+        self.queries.append((sql, job_config))
+        if self.on_query is not None:
+            self.on_query()
+        if self.error is not None:
+            raise self.error
+        return _fake_rows(self.columns, self.rows)
+
+    def get_table(self, ref):
+        from types import SimpleNamespace
+
+        self.tables_requested.append(ref)
+        return SimpleNamespace(schema=self.schema)
+
+    @property
+    def sql(self):
+        """SQL text of each submitted query."""
+        return [sql for sql, _ in self.queries]
+
+
+@pytest.fixture
+def fake_bigquery(monkeypatch):
+    """Point the server at a _FakeBigQuery, with empty caches and its own rate limiter."""
+    from tulip import mcp_server, security
+    from tulip.cache import TTLCache
+
+    fake = _FakeBigQuery()
+    monkeypatch.setenv("TULIP_BQ_PROJECT", "proj")
+    monkeypatch.setenv("TULIP_BQ_DATASET", "umcdb")
+    monkeypatch.setattr(mcp_server, "_bq_client", fake)
+    monkeypatch.setattr(mcp_server, "_query_cache", TTLCache(maxsize=8, ttl=60))
+    monkeypatch.setattr(mcp_server, "_schema_cache", TTLCache(maxsize=8, ttl=60))
+    monkeypatch.setattr(security, "_rate_limiter", security.RateLimiter(10_000, 10_000))
+    return fake
+
+
+@pytest.fixture
+def allow_all_sql(monkeypatch):
+    """Let every query pass enforce_security (for tests of execution, not validation)."""
+    from tulip import mcp_server
+
+    monkeypatch.setattr(mcp_server, "enforce_security", lambda sql: (True, "ok", ["person"]))
+
+
+class TestQueryCache:
+    """Tests for the in-process cache of repeated query results."""
+
+    @pytest.fixture(autouse=True)
+    def gender_counts(self, fake_bigquery, allow_all_sql):
+        fake_bigquery.returns(["gender", "count"], [("F", 120), ("M", 130)])
+
+    def test_repeated_query_served_from_cache(self, fake_bigquery):
+        """Cosmetically different copies of a query should run only one job."""
+        from tulip.mcp_server import _execute_bigquery_query
+
+        first = _execute_bigquery_query("SELECT gender, COUNT(*) AS count FROM person GROUP BY 1 LIMIT 10")
+        second = _execute_bigquery_query(
+            "SELECT gender,  COUNT(*) AS count -- again\nFROM person GROUP BY 1 LIMIT 10"
+        )
+
+        assert first == second
+        assert len(fake_bigquery.queries) == 1
+
+    def test_volatile_query_not_cached(self, fake_bigquery):
+        """Queries using CURRENT_DATE and similar should always run."""
+        from tulip.mcp_server import _execute_bigquery_query
+
+        sql = "SELECT gender, COUNT(*) AS count FROM person WHERE d < CURRENT_DATE() GROUP BY 1 LIMIT 10"
+        _execute_bigquery_query(sql)
+        _execute_bigquery_query(sql)
+
+        assert len(fake_bigquery.queries) == 2
+
+    def test_concurrent_identical_queries_share_one_job(self, fake_bigquery):
+        """A query arriving while an identical one runs should wait for its result."""
+        import threading
+        import time
+
+        from tulip import mcp_server
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def hold_open():
+            started.set()
+            release.wait(timeout=5)
+
+        fake_bigquery.on_query = hold_open
+
+        sql = "SELECT gender, COUNT(*) AS count FROM person GROUP BY 1 LIMIT 10"
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(mcp_server._execute_bigquery_query(sql)))
+                   for _ in range(2)]
+        threads[0].start()
+        started.wait(timeout=5)
+        threads[1].start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(fake_bigquery.queries) == 1
+        assert len(results) == 2 and results[0] == results[1]
+        assert mcp_server._inflight_queries == {}
+
+    def test_waiting_for_identical_query_times_out(self, fake_bigquery, monkeypatch):
+        """A caller should stop waiting on a slow identical query and run its own."""
+        import threading
+
+        from tulip import mcp_server
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def hold_first_open():
+            if len(fake_bigquery.queries) == 1:
+                started.set()
+                release.wait(timeout=5)
+
+        fake_bigquery.on_query = hold_first_open
+        monkeypatch.setattr(mcp_server, "_INFLIGHT_WAIT_SECONDS", 0.05)
+
+        sql = "SELECT gender, COUNT(*) AS count FROM person GROUP BY 1 LIMIT 10"
+        slow = threading.Thread(target=mcp_server._execute_bigquery_query, args=(sql,))
+        slow.start()
+        started.wait(timeout=5)
+
+        result = mcp_server._execute_bigquery_query(sql)
+        in_flight = dict(mcp_server._inflight_queries)
+        release.set()
+        slow.join(timeout=5)
+
+        assert "120" in result
+        assert len(fake_bigquery.queries) == 2
+        assert len(in_flight) == 1  # the slow query's claim survives the waiter's release
+        assert mcp_server._inflight_queries == {}
+
+
+class TestTemplateValidation:
+    """Tests for one-time validation of server-side SQL templates."""
+
+    def test_template_validated_once(self, fake_bigquery, monkeypatch):
+        """A template should be fully validated on first use only."""
+        from tulip import mcp_server
+
+        calls = {"full": 0, "trusted": 0}
+
+        def full(sql):
+            calls["full"] += 1
+            return True, "ok", ["person"]
+
+        def trusted(tables):
+            calls["trusted"] += 1
+            return True, "ok", list(tables)
+
+        monkeypatch.setattr(mcp_server, "_validated_templates", {})
+        monkeypatch.setattr(mcp_server, "enforce_security", full)
+        monkeypatch.setattr(mcp_server, "enforce_trusted_query", trusted)
+
+        for limit in (10, 20, 30):
+            mcp_server._execute_bigquery_query(f"SELECT 1 LIMIT {limit}", template="demo")
+
+        assert calls == {"full": 1, "trusted": 2}
+
+
+class TestQueryParameters:
+    """Tests for parameterized aggregate queries."""
+
+    def test_params_bound_on_job_config(self, fake_bigquery, allow_all_sql):
+        """Parameters should reach BigQuery and separate cache entries."""
+        from tulip import mcp_server
+
+        sql = "SELECT COUNT(*) AS n FROM person LIMIT @lim"
+        mcp_server._execute_bigquery_query(sql, params=[("lim", "INT64", 10)])
+        mcp_server._execute_bigquery_query(sql, params=[("lim", "INT64", 10)])
+        mcp_server._execute_bigquery_query(sql, params=[("lim", "INT64", 20)])
+
+        assert len(fake_bigquery.queries) == 2
+        assert fake_bigquery.queries[0][1].query_parameters[0].value == 10
+
+    def test_priority_set_on_job_config(self, fake_bigquery, allow_all_sql):
+        """A requested job priority should reach BigQuery."""
+        from tulip import mcp_server
+
+        mcp_server._execute_bigquery_query("SELECT COUNT(*) AS n FROM person LIMIT 1", priority="BATCH")
+
+        assert fake_bigquery.queries[0][1].priority == "BATCH"
+
+    def test_client_carries_default_job_config(self, monkeypatch):
+        """Cache use and the bytes cap should be client-wide job defaults."""
+        from tulip import mcp_server
+
+        created = {}
+
+        def fake_client(project, location=None, default_query_job_config=None):
+            created["location"] = location
+            created["config"] = default_query_job_config
+            return object()
+
+        monkeypatch.setenv("TULIP_BQ_PROJECT", "proj")
+        monkeypatch.setenv("TULIP_BQ_DATASET", "umcdb")
+        monkeypatch.setenv("TULIP_BQ_LOCATION", "EU")
+        monkeypatch.setattr(mcp_server.bigquery, "Client", fake_client)
+        monkeypatch.setattr(mcp_server, "_bq_client", None)
+        monkeypatch.setattr(mcp_server, "_bq_project", None)
+        monkeypatch.setattr(mcp_server, "_bq_config", None)
+
+        mcp_server._init_bigquery()
+
+        assert created["location"] == "EU"
+        assert created["config"].use_query_cache is True
+        assert created["config"].maximum_bytes_billed == mcp_server.MAX_BYTES_BILLED
+        assert created["config"].labels == {"app": "tulip"}
+
+
+class TestResultStreaming:
+    """Tests for streaming query results without a full dataframe."""
+
+    def test_only_preview_rows_kept(self):
+        """Large results should keep a preview but count every row."""
+        from tulip.mcp_server import _collect_rows
+
+        rows = _fake_rows(["unit", "n_count"], [(f"u{i}", 100 + i) for i in range(120)])
+        columns, preview, total, minimums = _collect_rows(rows, max_rows=50)
+
+        assert columns == ["unit", "n_count"]
+        assert len(preview) == 50
+        assert total == 120
+        assert minimums == {"n_count": 100}
+
+    def test_large_results_summarized_from_arrow(self, monkeypatch):
+        """Large results should give the same summary through the Arrow path."""
+        from tulip import mcp_server
+
+        data = [(f"u{i}", 100 + i) for i in range(300)]
+        expected = mcp_server._collect_rows(_fake_rows(["unit", "n_count"], data), max_rows=50)
+
+        monkeypatch.setattr(mcp_server, "_BQSTORAGE_MIN_ROWS", 100)
+        monkeypatch.setattr(mcp_server, "get_bqstorage_client", lambda: object())
+        actual = mcp_server._collect_rows(_fake_rows(["unit", "n_count"], data), max_rows=50)
+
+        assert actual == expected
+
+    def test_small_groups_blocked(self, fake_bigquery, allow_all_sql):
+        """A small group anywhere in the result should block the response."""
+        from tulip import mcp_server
+
+        fake_bigquery.returns(["group", "count"], [(f"g{i}", 50) for i in range(60)] + [("rare", 2)])
+
+        result = mcp_server._execute_bigquery_query("SELECT g, COUNT(*) AS count FROM person GROUP BY 1")
+
+        assert "Privacy Protection" in result
+
+    def test_format_rows_aligns_columns(self):
+        """Columns should be padded to their widest cell."""
+        from tulip.mcp_server import _format_rows
+
+        text = _format_rows(["unit", "count"], [("mmHg", 1200), ("bpm", 7), (None, 15)], max_rows=2)
+
+        assert text.splitlines() == [
+            "unit  count",
+            "mmHg   1200",
+            " bpm      7",
+        ]
+
+
+class TestConcurrentQueries:
+    """Tests for running queries off the event loop."""
+
+    def test_queries_bounded_by_slots(self, monkeypatch):
+        """No more than the configured number of queries should run at once."""
+        import asyncio
+        import threading
+        import time
+
+        from tulip import mcp_server
+
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_execute(sql, **kwargs):
+            with lock:
+                running.append(sql)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(sql)
+            return sql
+
+        monkeypatch.setattr(mcp_server, "_execute_bigquery_query", fake_execute)
+        monkeypatch.setattr(mcp_server, "_query_slots", asyncio.Semaphore(2))
+
+        async def run_all():
+            return await asyncio.gather(*(mcp_server._run_query(f"q{i}") for i in range(6)))
+
+        assert asyncio.run(run_all()) == [f"q{i}" for i in range(6)]
+        assert max(peak) == 2
+
+    def test_schema_and_search_tools_take_query_slots(self, monkeypatch):
+        """The schema, table-info and search tools run their BigQuery calls through the slots."""
+        import asyncio
+
+        from tulip import mcp_server
+
+        run_blocking = mcp_server._run_blocking
+        called = []
+
+        async def recording_run_blocking(func, *args, **kwargs):
+            called.append(func.__name__)
+            return await run_blocking(func, *args, **kwargs)
+
+        def dataset_tables_text(dataset_project, dataset):
+            return 1, "**person**"
+
+        def table_columns(dataset_project, dataset, table_name):
+            return (("person_id", "INT64", "NO"),)
+
+        def query_rows(sql, job_config=None):
+            return []
+
+        monkeypatch.setenv("TULIP_BQ_PROJECT", "proj")
+        monkeypatch.setenv("TULIP_BQ_DATASET", "umcdb")
+        monkeypatch.setattr(mcp_server, "_run_blocking", recording_run_blocking)
+        monkeypatch.setattr(mcp_server, "_dataset_tables_text", dataset_tables_text)
+        monkeypatch.setattr(mcp_server, "_table_columns", table_columns)
+        monkeypatch.setattr(mcp_server, "_query_rows", query_rows)
+
+        asyncio.run(mcp_server.get_database_schema())
+        asyncio.run(mcp_server.get_table_info("person", show_sample=False))
+        asyncio.run(mcp_server.search_by_source_text(
+            "device_exposure", "ECMO", source_column="device_source_value"
+        ))
+
+        assert called == ["dataset_tables_text", "table_columns", "query_rows"]
+
+
+class TestStatusBanner:
+    """Tests for the per-minute status banner cache."""
+
+    def test_banner_rendered_once_per_minute(self, monkeypatch):
+        """The banner should be rebuilt only when the minute changes."""
+        from tulip import mcp_server
+
+        now = [600.0]
+        calls = []
+
+        def fake_config():
+            calls.append(now[0])
+            return {"project": "demo-project", "dataset": "umcdb"}
+
+        monkeypatch.setattr(mcp_server.time, "time", lambda: now[0])
+        monkeypatch.setattr(mcp_server, "get_bigquery_config", fake_config)
+        mcp_server._status_banner_for_minute.cache_clear()
+
+        first = mcp_server._get_status_banner()
+        now[0] += 30
+        assert mcp_server._get_status_banner() == first
+        now[0] += 60
+        mcp_server._get_status_banner()
+        mcp_server._status_banner_for_minute.cache_clear()
+
+        assert "demo-project" in first
+        assert len(calls) == 2
+
+
+class TestTableColumns:
+    """Tests for table schema lookup through table metadata."""
+
+    def test_schema_fetched_once_per_table(self, fake_bigquery):
+        """Column metadata should come from get_table and be cached."""
+        from google.cloud.bigquery import SchemaField
+
+        from tulip import mcp_server
+
+        fake_bigquery.schema = [
+            SchemaField("person_id", "INTEGER", mode="REQUIRED"),
+            SchemaField("value_as_number", "FLOAT"),
+        ]
+
+        first = mcp_server._table_columns("proj", "umcdb", "measurement")
+        second = mcp_server._table_columns("proj", "umcdb", "measurement")
+
+        assert first == second == (
+            ("person_id", "INT64", "NO"),
+            ("value_as_number", "FLOAT64", "YES"),
+        )
+        assert fake_bigquery.tables_requested == ["proj.umcdb.measurement"]
+
+    def test_table_list_cached_per_dataset(self, fake_bigquery):
+        """The dataset table list should be queried once per dataset."""
+        from tulip import mcp_server
+
+        fake_bigquery.returns(["table_name"], [("death",), ("person",)])
+
+        first = mcp_server._dataset_tables_text("proj", "umcdb")
+        second = mcp_server._dataset_tables_text("proj", "umcdb")
+        mcp_server._dataset_tables_text("proj", "other")
+
+        assert first == second
+        assert first[0] == 2
+        assert "**person**" in first[1]
+        assert len(fake_bigquery.queries) == 2
+
+    def test_table_info_runs_lookups_concurrently(self, monkeypatch):
+        """Schema and sample lookups should overlap rather than run back to back."""
+        import asyncio
+        import threading
+
+        from tulip import mcp_server
+
+        both_started = threading.Barrier(2, timeout=5)
+
+        def columns(dataset_project, dataset, table_name):
+            both_started.wait()
+            return (("person_id", "INT64", "NO"),)
+
+        def sample(sql):
+            both_started.wait()
+            return "person_id\n        1"
+
+        monkeypatch.setenv("TULIP_BQ_PROJECT", "proj")
+        monkeypatch.setenv("TULIP_BQ_DATASET", "umcdb")
+        monkeypatch.setattr(mcp_server, "_table_columns", columns)
+        monkeypatch.setattr(mcp_server, "_execute_bigquery_query", sample)
+
+        result = asyncio.run(mcp_server.get_table_info("person"))
+
+        assert "person_id" in result
+        assert "Sample Data" in result
+
+
+class TestSourceTextSearch:
+    """Tests for search_by_source_text."""
+
+    SEARCH_COLUMNS = ("source_value", "patient_count", "event_count")
+
+    @pytest.fixture
+    def search(self, fake_bigquery):
+        """Run search_by_source_text to completion against the fake client."""
+        import asyncio
+
+        from tulip import mcp_server
+
+        fake_bigquery.returns(self.SEARCH_COLUMNS, [])
+
+        def run(table="device_exposure", term="ECMO", **kwargs):
+            kwargs.setdefault("source_column", "device_source_value")
+            return asyncio.run(mcp_server.search_by_source_text(table, term, **kwargs))
+
+        return run
+
+    def test_source_column_detected_from_table_metadata(self, search, fake_bigquery, monkeypatch):
+        """Source column detection should use cached metadata, not INFORMATION_SCHEMA."""
+        from tulip import mcp_server
+
+        def columns(dataset_project, dataset, table_name):
+            return (
+                ("person_id", "INT64", "NO"),
+                ("device_source_value", "STRING", "YES"),
+            )
+
+        monkeypatch.setattr(mcp_server, "_table_columns", columns)
+
+        result = search(source_column=None)
+
+        assert "`device_source_value`" in result
+        assert len(fake_bigquery.queries) == 1
+        assert "INFORMATION_SCHEMA" not in fake_bigquery.sql[0]
+
+    def test_search_term_bound_as_parameter(self, search, fake_bigquery):
+        """The search term should be a query parameter, not part of the SQL text."""
+        search(term="O'Brien")
+
+        sql, job_config = fake_bigquery.queries[0]
+        assert "CONTAINS_SUBSTR(`device_source_value`, @term)" in sql
+        assert "Brien" not in sql
+        assert [(p.name, p.value) for p in job_config.query_parameters] == [
+            ("term", "O'Brien"),
+            ("lim", 100),
+        ]
+
+    def test_anchored_terms_use_prefix_and_suffix_matches(self):
+        """Wildcards only at the start or end should become ENDS_WITH / STARTS_WITH."""
+        from tulip.mcp_server import _source_text_match
+
+        col = "device_source_value"
+        assert _source_text_match(col, "ECMO%") == (
+            "STARTS_WITH(LOWER(CAST(`device_source_value` AS STRING)), LOWER(@term))", "ECMO"
+        )
+        assert _source_text_match(col, "%pump") == (
+            "ENDS_WITH(LOWER(CAST(`device_source_value` AS STRING)), LOWER(@term))", "pump"
+        )
+        assert _source_text_match(col, "%ECMO%") == ("CONTAINS_SUBSTR(`device_source_value`, @term)", "ECMO")
+        assert _source_text_match(col, "50%_O2") == ("CONTAINS_SUBSTR(`device_source_value`, @term)", "50%_O2")
+        assert _source_text_match(col, "%") == ("CONTAINS_SUBSTR(`device_source_value`, @term)", "%")
+
+    def test_identifiers_validated(self, search, fake_bigquery):
+        """Table and column names that are not plain identifiers should be rejected."""
+        bad_table = search(table="person` WHERE 1=1 --")
+        bad_column = search(source_column="a`, person_id, `b")
+
+        assert "Invalid table name" in bad_table
+        assert "Invalid column name" in bad_column
+        assert fake_bigquery.queries == []
+
+    def test_totals_come_from_query(self, search, fake_bigquery):
+        """Totals should be read from the query's window columns, not re-summed."""
+        fake_bigquery.returns(
+            [*self.SEARCH_COLUMNS, "distinct_values", "total_patients", "total_events"],
+            [("ECMO", 40, 90, 25, 300, 700), ("ECMO pump", 12, 30, 25, 300, 700)],
+        )
+
+        result = search()
+
+        assert "LIMIT 20" in fake_bigquery.sql[0]
+        assert "Found 25 distinct values (showing top 2)" in result
+        assert "| ECMO pump | 12 | 30 |" in result
+        assert "Total distinct patients: 300" in result
+        assert "Total events: 700" in result
+
+    def test_dangerous_filters_rejected(self, search, fake_bigquery):
+        """Statements and comments in filters are rejected; similar column names are not."""
+        for bad in ("1=1; DROP TABLE person", "x = 1 -- comment", "x /* y */ = 1", "delete_flag = 0 OR DELETE"):
+            assert "potentially dangerous SQL" in search(additional_filters=bad)
+        assert fake_bigquery.queries == []
+
+        search(additional_filters="update_datetime IS NOT NULL")
+        assert len(fake_bigquery.queries) == 1
+
+    def test_search_job_timeout(self, search, fake_bigquery):
+        """Search jobs carry a BigQuery-side timeout and explain when they hit it."""
+        from tulip import mcp_server
+
+        fake_bigquery.error = RuntimeError("Job timed out after 30 sec")
+
+        result = search()
+
+        assert int(fake_bigquery.queries[0][1].job_timeout_ms) == mcp_server.SEARCH_JOB_TIMEOUT_MS
+        assert "scans the whole column" in result
+
+    def test_empty_search_reports_no_results(self, search):
+        """An empty search result should explain that nothing matched."""
+        assert "No results found" in search()
+
+
+class TestConceptSearch:
+    """Tests for search_concepts result formatting."""
+
+    def test_rows_formatted_and_domain_filter_kept(self, monkeypatch):
+        """Each row is formatted, and the header shows the requested domain filter."""
+        from tulip import config, mcp_server
+
+        def fake_search(search_term, domain=None, limit=20):
+            return [
+                {"concept_id": 4052536, "concept_name": "ECMO", "domain_id": "Procedure",
+                 "source_code_description": "Extracorporeal membrane oxygenation"},
+                {"concept_id": None, "concept_name": None, "domain_id": None,
+                 "source_code_description": "ECMO flow"},
+            ]
+
+        monkeypatch.setattr(config, "search_concepts_in_dictionary", fake_search)
+
+        result = mcp_server.search_concepts("ecmo", domain="procedure")
+
+        assert "(domain: procedure)" in result
+        assert "| 4052536 | ECMO | Procedure | Extracorporeal membrane oxygenation |" in result
+        assert "| UNMAPPED | N/A | Unknown | ECMO flow |" in result
+
+
+class TestErrorGuidance:
+    """Tests for error guidance suggestions."""
+
+    def test_suggestions_follow_keywords(self):
+        """Matched keywords should select their suggestions case-insensitively."""
+        from tulip.mcp_server import _format_error_with_guidance
+
+        text = _format_error_with_guidance("Unrecognized name: Column foo NOT FOUND")
+
+        assert "case-sensitive" in text
+        assert text.index("case-sensitive") < text.index("OMOP CDM conventions")
+        assert "credentials" not in text
+
+    def test_bytes_billed_error_explains_scan_limit(self):
+        """Jobs rejected by the bytes cap should point at narrowing the scan."""
+        from tulip.mcp_server import _format_error_with_guidance
+
+        text = _format_error_with_guidance("Query exceeded limit for bytes billed: [REDACTED].")
+
+        assert "would scan more than" in text
+
+
+class TestGroupSizeFastPath:
+    """Tests for skipping the row-level privacy scan on self-suppressing templates."""
+
+    def test_templates_enforce_group_size(self):
+        """Every aggregate template should end in a qualifying HAVING clause."""
+        from tulip import mcp_server
+
+        for sql in (
+            mcp_server._DEMOGRAPHICS_SQL,
+            mcp_server._DRUG_EXPOSURE_SQL,
+            mcp_server._CONDITION_PREVALENCE_SQL,
+            mcp_server._MORTALITY_SQL,
+        ):
+            assert mcp_server._enforces_min_group_size(sql)
+
+    def test_weak_or_nested_having_not_trusted(self):
+        """Lower thresholds or HAVING clauses in subqueries should not qualify."""
+        from tulip.mcp_server import _enforces_min_group_size
+
+        assert not _enforces_min_group_size("SELECT a FROM t GROUP BY a HAVING COUNT(*) >= 2")
+        assert not _enforces_min_group_size(
+            "SELECT * FROM (SELECT a FROM t GROUP BY a HAVING COUNT(*) >= 5) s JOIN u USING (a)"
+        )
+
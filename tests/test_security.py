@@ -101,6 +101,16 @@ class TestReidentificationProtection:
         assert not is_safe
         assert "group size" in message.lower() or "privacy" in message.lower()
 
+    def test_blocks_extreme_value_queries(self):
+        """Extreme-value searches should be blocked with that check's message."""
+        from tulip.security import validate_query_security
+        
+        query = "SELECT MIN(year_of_birth) FROM person LIMIT 10"
+        is_safe, message, _ = validate_query_security(query)
+        
+        assert not is_safe
+        assert "extreme birth year" in message
+
 
 class TestRateLimiting:
     """Tests for rate limiting functionality."""
@@ -130,6 +140,72 @@ class TestRateLimiting:
         assert not allowed
         assert "rate limit" in message.lower()
 
+    def test_rate_limiter_refills_over_time(self, monkeypatch):
+        """Spent tokens should be restored at the configured rate."""
+        from tulip import security
+        
+        now = [1000.0]
+        monkeypatch.setattr(security.time, "monotonic", lambda: now[0])
+        
+        limiter = security.RateLimiter(max_queries_per_hour=100, max_queries_per_minute=2)
+        limiter.record_query()
+        limiter.record_query()
+        assert not limiter.check_rate_limit()[0]
+        
+        now[0] += 30  # half a minute refills one per-minute token
+        assert limiter.check_rate_limit()[0]
+        assert limiter.tokens_available() == 98
+
+    def test_trusted_queries_are_rate_limited(self, monkeypatch):
+        """Pre-validated template queries must still count against the limit."""
+        from tulip import security
+        
+        monkeypatch.setattr(
+            security, "_rate_limiter",
+            security.RateLimiter(max_queries_per_hour=100, max_queries_per_minute=2),
+        )
+        
+        assert security.enforce_trusted_query(["person"])[0]
+        assert security.enforce_trusted_query(["person"])[0]
+        allowed, message, _ = security.enforce_trusted_query(["person"])
+        assert not allowed
+        assert "rate limit" in message.lower()
+
+    def test_concurrent_acquires_respect_limit(self):
+        """Concurrent callers must not all be admitted against the same tokens."""
+        import threading
+        
+        from tulip.security import RateLimiter
+        
+        limiter = RateLimiter(max_queries_per_hour=100, max_queries_per_minute=3)
+        start = threading.Barrier(10, timeout=5)
+        results = []
+        
+        def acquire():
+            start.wait()
+            results.append(limiter.try_acquire()[0])
+        
+        threads = [threading.Thread(target=acquire) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert results.count(True) == 3
+        assert limiter.tokens_available() == 97
+
+    def test_rejected_queries_not_counted(self, monkeypatch):
+        """Queries that fail validation should give their rate-limit token back."""
+        from tulip import security
+        
+        limiter = security.RateLimiter(max_queries_per_hour=100, max_queries_per_minute=2)
+        monkeypatch.setattr(security, "_rate_limiter", limiter)
+        
+        for _ in range(3):
+            assert not security.enforce_security("DELETE FROM person")[0]
+        
+        assert limiter.try_acquire()[0]
+
 
 class TestAuditLogging:
     """Tests for privacy-preserving audit logging."""
@@ -173,6 +249,40 @@ class TestAuditLogging:
         entry = log.entries[0]
         assert len(entry["query_hash"]) == 16  # Truncated
 
+    def test_audit_log_keeps_last_1000_entries(self):
+        """Audit log should keep only the most recent 1000 entries."""
+        from tulip.security import QueryAuditLog
+        
+        log = QueryAuditLog()
+        for i in range(1005):
+            log.log_query(
+                query_hash=f"{i:016d}",
+                tables_accessed=["person"],
+                query_type="SELECT",
+                success=True,
+            )
+        
+        assert len(log.entries) == 1000
+        assert log.entries[0]["query_hash"] == f"{5:016d}"
+
+    def test_audit_summary_counts_whole_session(self):
+        """Summary totals should include entries already rotated out."""
+        from tulip.security import QueryAuditLog
+        
+        log = QueryAuditLog()
+        for i in range(1005):
+            log.log_query(
+                query_hash=f"{i:016d}",
+                tables_accessed=["person"],
+                query_type="SELECT",
+                success=i % 5 != 0,
+            )
+        
+        summary = log.get_summary()
+        assert summary["total_queries"] == 1005
+        assert summary["failed"] == 201
+        assert summary["tables_queried"] == ["person"]
+
 
 class TestSQLInjectionProtection:
     """Tests for SQL injection prevention."""